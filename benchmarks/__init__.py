@@ -0,0 +1,16 @@
+"""Benchmarks for the EARN-E P1 Meter integration.
+
+The ingest benchmarks use pytest-benchmark and are kept out of the default
+test run. They fail when the per-packet latency, the memory a packet
+allocates or the memory it leaves behind exceeds the limits in
+``thresholds.json``. Those limits are loose enough for a CI runner; for
+a tighter check save a baseline before a change and compare against it
+after::
+
+    pytest benchmarks --benchmark-save=baseline
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
+The comparison fails when the mean time per batch regresses by more
+than 10%. The benchmarks workflow compares every pull request against its
+base branch the same way, allowing 25% for noisy runners.
+"""
@@ -0,0 +1,47 @@
+"""Micro-benchmark of the registered datagram decoders.
+
+Run with ``python -m benchmarks.bench_decode`` from the repository root.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from custom_components.earn_e_p1.decoder import DECODERS
+
+REALTIME_PACKET = (
+    b'{"power_delivered":0.456,"power_returned":0.000,'
+    b'"voltage_l1":230.1,"current_l1":2}'
+)
+FULL_TELEGRAM = (
+    b'{"serial":"E0012345678901234","model":"P1-Monitor","swVersion":"1.2.3",'
+    b'"wifiRSSI":-61,"power_delivered":0.456,"power_returned":0.000,'
+    b'"voltage_l1":230.1,"current_l1":2,"energy_delivered_tariff1":12345.678,'
+    b'"energy_delivered_tariff2":23456.789,"energy_returned_tariff1":1234.567,'
+    b'"energy_returned_tariff2":2345.678,"gas_delivered":4567.891}'
+)
+
+
+def main() -> None:
+    """Time every decoder on realtime and full telegram packets."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for label, packet in (("realtime", REALTIME_PACKET), ("telegram", FULL_TELEGRAM)):
+        baseline: float | None = None
+        for name, decoder in DECODERS.items():
+            best = min(
+                timeit.repeat(lambda: decoder(packet), number=args.number, repeat=5)
+            )
+            per_packet = best / args.number * 1e6
+            baseline = baseline or per_packet
+            print(
+                f"{label:9} {name:7} {per_packet:7.3f} us/packet "
+                f"({baseline / per_packet:4.1f}x vs json)"
+            )
+
+
+if __name__ == "__main__":
+    main()
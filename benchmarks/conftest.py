@@ -0,0 +1,121 @@
+"""Shared fixtures for EARN-E P1 Meter benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.earn_e_p1.const import DOMAIN
+from custom_components.earn_e_p1.coordinator import (
+    EarnEP1Coordinator,
+    EarnEP1UDPProtocol,
+)
+
+MOCK_HOST = "192.168.1.100"
+MOCK_SERIAL = "E0012345678901234"
+ADDR = (MOCK_HOST, 16121)
+
+# Packets processed per benchmark round, so the cost of driving the event
+# loop from a synchronous benchmark is amortized
+BATCH_SIZE = 500
+
+# Per-packet latency and retained memory limits the benchmarks must stay under
+THRESHOLDS = json.loads((Path(__file__).parent / "thresholds.json").read_text())
+
+
+def realtime_packets(count: int = BATCH_SIZE) -> list[bytes]:
+    """Return realtime packets whose values change on every packet."""
+    return [
+        json.dumps(
+            {
+                "power_delivered": round(0.5 + i * 0.001, 3),
+                "power_returned": 0.0,
+                "voltage_l1": round(229.0 + (i % 20) / 10, 1),
+                "current_l1": round(2.0 + (i % 7) / 10, 1),
+            }
+        ).encode()
+        for i in range(count)
+    ]
+
+
+def telegram_packets(count: int = BATCH_SIZE) -> list[bytes]:
+    """Return full telegrams whose counters increase on every packet."""
+    return [
+        json.dumps(
+            {
+                "serial": MOCK_SERIAL,
+                "model": "P1-Monitor",
+                "swVersion": "1.2.3",
+                "wifiRSSI": -60 - i % 5,
+                "power_delivered": round(0.5 + i * 0.001, 3),
+                "power_returned": 0.0,
+                "voltage_l1": round(229.0 + (i % 20) / 10, 1),
+                "current_l1": round(2.0 + (i % 7) / 10, 1),
+                "energy_delivered_tariff1": round(12345.678 + i * 0.001, 3),
+                "energy_delivered_tariff2": 23456.789,
+                "energy_returned_tariff1": 1234.567,
+                "energy_returned_tariff2": 2345.678,
+                "gas_delivered": round(4567.891 + i * 0.001, 3),
+            }
+        ).encode()
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable custom integrations in all benchmarks."""
+
+
+@pytest.fixture
+async def coordinator(hass: HomeAssistant) -> EarnEP1Coordinator:
+    """Set up the integration with all sensor entities attached."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=f"EARN-E P1 ({MOCK_HOST})",
+        data={CONF_HOST: MOCK_HOST, "serial": MOCK_SERIAL},
+        unique_id=MOCK_SERIAL,
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.earn_e_p1.coordinator.EarnEP1Coordinator.async_start",
+        new_callable=AsyncMock,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry.runtime_data
+
+
+@pytest.fixture
+def protocol(coordinator: EarnEP1Coordinator) -> EarnEP1UDPProtocol:
+    """Return a UDP protocol feeding the coordinator."""
+    return EarnEP1UDPProtocol(coordinator)
+
+
+@pytest.fixture
+def ingest(
+    hass: HomeAssistant, protocol: EarnEP1UDPProtocol
+) -> Callable[[Sequence[bytes]], None]:
+    """Return a function that pushes packets through to the state machine.
+
+    Each packet is followed by one event loop iteration, which runs the
+    protocol flush and the resulting entity state writes.
+    """
+
+    async def _feed(packets: Sequence[bytes]) -> None:
+        for packet in packets:
+            protocol.datagram_received(packet, ADDR)
+            await asyncio.sleep(0)
+
+    def _ingest(packets: Sequence[bytes]) -> None:
+        hass.loop.run_until_complete(_feed(packets))
+
+    return _ingest
@@ -0,0 +1,213 @@
+"""EARN-E device emulator for load and soak testing.
+
+Sends EARN-E shaped JSON datagrams to the integration's UDP port, so the
+real listener can be exercised end to end without hardware. Every
+simulated meter sends a realtime packet every second and a full telegram
+every 60 seconds, like the device does. Each meter uses its own serial and
+its own loopback source address (127.0.0.2, 127.0.0.3, ...).
+
+Only the standard library is used, so the emulator can run on any host::
+
+    python benchmarks/emulator.py --meters 3 --rate 10 --loss 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import random
+import time
+from dataclasses import dataclass, field
+
+DEFAULT_PORT = 16121
+TELEGRAM_INTERVAL = 60.0
+
+
+@dataclass
+class EmulatorStats:
+    """Counters for the datagrams the emulator produced."""
+
+    sent: int = 0
+    lost: int = 0
+    duplicated: int = 0
+    malformed: int = 0
+
+
+@dataclass
+class SimulatedMeter:
+    """State of a single simulated EARN-E meter."""
+
+    serial: str
+    rng: random.Random
+    power_delivered: float = 0.5
+    power_returned: float = 0.0
+    energy_delivered: list[float] = field(default_factory=lambda: [12345.0, 23456.0])
+    energy_returned: list[float] = field(default_factory=lambda: [1234.0, 2345.0])
+    gas_delivered: float = 4567.0
+
+    def step(self, elapsed: float) -> None:
+        """Advance the simulated load and counters by elapsed seconds."""
+        net = max(-4.0, min(8.0, self.power_delivered - self.power_returned))
+        net += self.rng.uniform(-0.05, 0.05)
+        self.power_delivered = round(max(net, 0.0), 3)
+        self.power_returned = round(max(-net, 0.0), 3)
+        tariff = 0 if time.localtime().tm_hour < 7 else 1
+        self.energy_delivered[tariff] += self.power_delivered * elapsed / 3600
+        self.energy_returned[tariff] += self.power_returned * elapsed / 3600
+        if self.rng.random() < 0.05:
+            self.gas_delivered += 0.001
+
+    def realtime(self) -> dict[str, float]:
+        """Return a realtime packet."""
+        return {
+            "power_delivered": self.power_delivered,
+            "power_returned": self.power_returned,
+            "voltage_l1": round(self.rng.gauss(230.0, 0.8), 1),
+            "current_l1": round(
+                (self.power_delivered + self.power_returned) * 1000 / 230, 1
+            ),
+        }
+
+    def telegram(self) -> dict[str, float | int | str]:
+        """Return a full telegram."""
+        return {
+            "serial": self.serial,
+            "model": "P1-Monitor",
+            "swVersion": "1.0.0",
+            "wifiRSSI": self.rng.randint(-75, -55),
+            **self.realtime(),
+            "energy_delivered_tariff1": round(self.energy_delivered[0], 3),
+            "energy_delivered_tariff2": round(self.energy_delivered[1], 3),
+            "energy_returned_tariff1": round(self.energy_returned[0], 3),
+            "energy_returned_tariff2": round(self.energy_returned[1], 3),
+            "gas_delivered": round(self.gas_delivered, 3),
+        }
+
+
+async def run_meter(
+    meter: SimulatedMeter,
+    source: str,
+    args: argparse.Namespace,
+    stats: EmulatorStats,
+) -> None:
+    """Send packets for one meter until the duration has elapsed."""
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol,
+        local_addr=(source, 0),
+        remote_addr=(args.host, args.port),
+    )
+    rng = meter.rng
+    interval = 1.0 / args.rate
+    start = last = loop.time()
+    next_telegram = start
+    try:
+        while args.duration is None or loop.time() - start < args.duration:
+            now = loop.time()
+            meter.step(now - last)
+            last = now
+
+            if now >= next_telegram:
+                payload = meter.telegram()
+                next_telegram = now + TELEGRAM_INTERVAL / args.speedup
+            else:
+                payload = meter.realtime()
+            data = json.dumps(payload, separators=(",", ":")).encode()
+
+            if rng.random() < args.malformed:
+                data = data[: rng.randrange(1, len(data))]
+                stats.malformed += 1
+            if rng.random() < args.loss:
+                stats.lost += 1
+            else:
+                copies = 2 if rng.random() < args.duplicates else 1
+                stats.duplicated += copies - 1
+                for _ in range(copies):
+                    transport.sendto(data)
+                    stats.sent += 1
+
+            delay = interval * (1 + rng.uniform(-args.jitter, args.jitter))
+            await asyncio.sleep(max(delay, 0.0))
+    finally:
+        transport.close()
+
+
+async def run(args: argparse.Namespace) -> EmulatorStats:
+    """Run all simulated meters concurrently."""
+    stats = EmulatorStats()
+    first_source = ipaddress.IPv4Address(args.source)
+    meters = [
+        run_meter(
+            SimulatedMeter(
+                serial=f"E00{args.serial_base + i:014d}",
+                rng=random.Random(args.seed + i),
+            ),
+            str(first_source + i),
+            args,
+            stats,
+        )
+        for i in range(args.meters)
+    ]
+    try:
+        await asyncio.gather(*meters)
+    except asyncio.CancelledError:
+        pass
+    return stats
+
+
+def main() -> None:
+    """Parse arguments and run the emulator."""
+    parser = argparse.ArgumentParser(
+        description="Send EARN-E P1 JSON datagrams for load testing."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="target address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--meters", type=int, default=1, help="simulated meters")
+    parser.add_argument(
+        "--source",
+        default="127.0.0.2",
+        help="source address of the first meter; later meters count up",
+    )
+    parser.add_argument("--serial-base", type=int, default=12345678901234)
+    parser.add_argument(
+        "--rate", type=float, default=1.0, help="packets per second per meter"
+    )
+    parser.add_argument(
+        "--speedup",
+        type=float,
+        default=1.0,
+        help="divide the 60 s full telegram interval by this factor",
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.1, help="relative send interval jitter"
+    )
+    parser.add_argument("--loss", type=float, default=0.0, help="drop probability")
+    parser.add_argument(
+        "--duplicates", type=float, default=0.0, help="duplicate probability"
+    )
+    parser.add_argument(
+        "--malformed", type=float, default=0.0, help="truncation probability"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=None, help="seconds to run (default: forever)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    try:
+        stats = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return
+    elapsed = time.monotonic() - started
+    print(
+        f"sent={stats.sent} lost={stats.lost} duplicated={stats.duplicated} "
+        f"malformed={stats.malformed} in {elapsed:.1f}s "
+        f"({stats.sent / elapsed:.0f} packets/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
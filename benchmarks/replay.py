@@ -0,0 +1,78 @@
+"""Replay a datagram capture over UDP.
+
+Sends the datagrams from one or more capture files (written by the
+integration's capture option) to a running listener, at the original
+speed, N times faster, or as fast as possible::
+
+    python -m benchmarks.replay captures/earn_e_p1-*.jsonl.gz --speed 10
+
+Use ``--source`` to send from the loopback address the config entry
+expects; the captured source address cannot be reproduced otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from custom_components.earn_e_p1.capture import async_replay, read_capture
+
+DEFAULT_PORT = 16121
+
+
+class _Sender(asyncio.DatagramProtocol):
+    """Forward replayed datagrams to the target address."""
+
+    def __init__(self) -> None:
+        """Initialize the sender."""
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        self.transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Send a replayed datagram."""
+        assert self.transport is not None
+        self.transport.sendto(data)
+
+
+async def _run(args: argparse.Namespace) -> int:
+    """Replay the capture files and return the number of datagrams sent."""
+    loop = asyncio.get_running_loop()
+    transport, sender = await loop.create_datagram_endpoint(
+        _Sender,
+        local_addr=(args.source, 0),
+        remote_addr=(args.host, args.port),
+    )
+    try:
+        return await async_replay(read_capture(args.files), sender, speed=args.speed)
+    finally:
+        transport.close()
+
+
+def main() -> None:
+    """Parse arguments and replay the capture."""
+    parser = argparse.ArgumentParser(description="Replay EARN-E datagram captures.")
+    parser.add_argument("files", nargs="+", type=Path, help="capture files")
+    parser.add_argument("--host", default="127.0.0.1", help="target address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--source", default="127.0.0.2", help="source address")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="playback speed multiplier; 0 sends as fast as possible",
+    )
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    sent = asyncio.run(_run(args))
+    elapsed = time.monotonic() - started
+    print(f"replayed {sent} datagrams in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
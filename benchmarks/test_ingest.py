@@ -0,0 +1,160 @@
+"""Benchmarks for the EARN-E P1 Meter UDP ingest path."""
+
+from __future__ import annotations
+
+import gc
+import glob
+import os
+import tracemalloc
+from collections.abc import Callable, Sequence
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.earn_e_p1.capture import async_replay, read_capture
+from custom_components.earn_e_p1.coordinator import EarnEP1UDPProtocol
+
+from .conftest import (
+    ADDR,
+    BATCH_SIZE,
+    THRESHOLDS,
+    realtime_packets,
+    telegram_packets,
+)
+
+# Glob of capture files to replay, e.g. a day of real meter traffic
+CAPTURE_ENV = "EARN_E_CAPTURE"
+
+
+def _check_rates(benchmark) -> None:
+    """Store packets/sec and per-packet latency and check the threshold."""
+    if benchmark.disabled:
+        return
+    mean = benchmark.stats.stats.mean
+    latency = mean / BATCH_SIZE * 1e6
+    benchmark.extra_info["packets_per_second"] = round(BATCH_SIZE / mean)
+    benchmark.extra_info["latency_us"] = round(latency, 2)
+    assert latency < THRESHOLDS["latency_us"][benchmark.name]
+
+
+@pytest.mark.parametrize(
+    "packets",
+    [
+        pytest.param(realtime_packets(), id="realtime"),
+        pytest.param(telegram_packets(), id="telegram"),
+    ],
+)
+def test_ingest_throughput(
+    benchmark,
+    hass: HomeAssistant,
+    ingest: Callable[[Sequence[bytes]], None],
+    packets: list[bytes],
+) -> None:
+    """Measure datagram to state write throughput."""
+    ingest(packets[:1])
+
+    benchmark.pedantic(ingest, args=(packets,), rounds=20, warmup_rounds=2)
+    _check_rates(benchmark)
+
+    state = hass.states.get("sensor.earn_e_p1_meter_power_delivered")
+    assert float(state.state) == pytest.approx(0.5 + (BATCH_SIZE - 1) * 0.001)
+
+
+def test_unchanged_packets_throughput(
+    benchmark, ingest: Callable[[Sequence[bytes]], None]
+) -> None:
+    """Measure the cost of repeated packets.
+
+    Identical datagrams within the duplicate window are dropped before
+    decoding, so this is the cost of the hash lookup.
+    """
+    packets = realtime_packets(1) * BATCH_SIZE
+    ingest(packets[:1])
+
+    benchmark.pedantic(ingest, args=(packets,), rounds=20, warmup_rounds=2)
+    _check_rates(benchmark)
+
+
+def test_memory_retained_per_packet(
+    record_property, ingest: Callable[[Sequence[bytes]], None]
+) -> None:
+    """Measure the memory blocks and bytes a processed packet leaves behind.
+
+    Anything above the thresholds is a leak in the ingest path.
+    """
+    packets = realtime_packets()
+    ingest(packets)
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        ingest(packets)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Leave out the snapshots themselves
+    own = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    diff = after.filter_traces(own).compare_to(before.filter_traces(own), "filename")
+    retained_bytes = sum(stat.size_diff for stat in diff) / BATCH_SIZE
+    retained_blocks = sum(stat.count_diff for stat in diff) / BATCH_SIZE
+    record_property("peak_bytes", peak)
+    record_property("retained_bytes_per_packet", retained_bytes)
+    record_property("retained_blocks_per_packet", retained_blocks)
+    assert retained_bytes < THRESHOLDS["retained_bytes_per_packet"]
+    assert retained_blocks < THRESHOLDS["retained_blocks_per_packet"]
+
+
+def test_memory_allocated_per_packet(
+    record_property, ingest: Callable[[Sequence[bytes]], None]
+) -> None:
+    """Measure the transient memory a packet allocates while it is processed.
+
+    This is the tracemalloc peak above the memory in use before each
+    packet, so per-packet garbage shows up even when it is all freed.
+    """
+    packets = realtime_packets()
+    ingest(packets)
+    gc.collect()
+
+    allocated: list[int] = []
+    tracemalloc.start()
+    try:
+        for packet in packets:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            ingest((packet,))
+            allocated.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+
+    mean = sum(allocated) / len(allocated)
+    record_property("allocated_bytes_per_packet", mean)
+    record_property("max_allocated_bytes_per_packet", max(allocated))
+    assert mean < THRESHOLDS["allocated_bytes_per_packet"]
+
+
+@pytest.mark.skipif(
+    not os.environ.get(CAPTURE_ENV), reason=f"set {CAPTURE_ENV} to a capture glob"
+)
+def test_replay_capture_throughput(
+    benchmark, hass: HomeAssistant, protocol: EarnEP1UDPProtocol
+) -> None:
+    """Measure ingest of recorded meter traffic at maximum speed."""
+    files = sorted(glob.glob(os.environ[CAPTURE_ENV]))
+    packets = list(read_capture(files))
+
+    def _replay() -> int:
+        return hass.loop.run_until_complete(
+            async_replay(packets, protocol, speed=0, addr=ADDR)
+        )
+
+    benchmark.pedantic(_replay, rounds=5, warmup_rounds=1)
+    if not benchmark.disabled:
+        mean = benchmark.stats.stats.mean
+        benchmark.extra_info["packets"] = len(packets)
+        benchmark.extra_info["packets_per_second"] = round(len(packets) / mean)
@@ -7,18 +7,30 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DEFAULT_PORT
+from .const import DEFAULT_PORT, DOMAIN, STORAGE_KEY, STORAGE_VERSION
 from .coordinator import EarnEP1Coordinator
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 type EarnEP1ConfigEntry = ConfigEntry[EarnEP1Coordinator]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the EARN-E P1 Meter services."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: EarnEP1ConfigEntry) -> bool:
     """Set up EARN-E P1 Meter from a config entry."""
     host = entry.data[CONF_HOST]
@@ -32,6 +44,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: EarnEP1ConfigEntry) -> b
         )
 
     coordinator = EarnEP1Coordinator(hass, entry, host, serial=serial)
+    await coordinator.async_restore()
 
     try:
         await coordinator.async_start()
@@ -39,13 +52,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: EarnEP1ConfigEntry) -> b
         raise ConfigEntryNotReady(
             f"Cannot start UDP listener on port {DEFAULT_PORT}: {err}"
         ) from err
+    except ValueError as err:
+        raise ConfigEntryError(str(err)) from err
 
     entry.runtime_data = coordinator
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+async def _async_update_listener(
+    hass: HomeAssistant, entry: EarnEP1ConfigEntry
+) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: EarnEP1ConfigEntry) -> bool:
     """Unload a config entry."""
     await entry.runtime_data.async_stop()
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: EarnEP1ConfigEntry) -> None:
+    """Remove the stored telegram of a deleted config entry."""
+    await Store(
+        hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)
+    ).async_remove()
@@ -0,0 +1,35 @@
+"""Tumbling averages of realtime values for the EARN-E P1 Meter."""
+
+from __future__ import annotations
+
+
+class TumblingAverage:
+    """Mean over consecutive, clock-aligned windows in O(1) per sample.
+
+    Only a running sum and count are kept. The mean of a window is returned
+    by the first sample that falls into the next one, so it is published
+    once per window.
+    """
+
+    __slots__ = ("_count", "_total", "_window_start", "window")
+
+    def __init__(self, window: float) -> None:
+        """Initialize an average over windows of the given seconds."""
+        self.window = window
+        self._window_start: float | None = None
+        self._total = 0.0
+        self._count = 0
+
+    def add(self, timestamp: float, value: float) -> float | None:
+        """Add a sample and return the previous window's mean if it ended."""
+        window_start = timestamp - timestamp % self.window
+        mean: float | None = None
+        if window_start != self._window_start:
+            if self._count:
+                mean = self._total / self._count
+            self._window_start = window_start
+            self._total = 0.0
+            self._count = 0
+        self._total += value
+        self._count += 1
+        return mean
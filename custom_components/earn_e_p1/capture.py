@@ -0,0 +1,240 @@
+"""Capture and replay of raw EARN-E P1 datagrams.
+
+Captures are gzip-compressed JSON Lines files with one datagram per line::
+
+    {"t": 1760000000.123, "src": "192.168.1.100", "port": 16121, "data": "..."}
+
+``data`` holds the raw datagram decoded as latin-1, so malformed packets
+round-trip byte for byte.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import queue
+import threading
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAX_BYTES = 16 * 1024 * 1024
+CAPTURE_BACKUP_COUNT = 10
+CAPTURE_GLOB = "earn_e_p1-*.jsonl.gz"
+# Datagrams waiting for the writer thread before new ones are dropped
+CAPTURE_QUEUE_SIZE = 4096
+# Seconds between flushes of the compressed stream, so a crash loses at
+# most this much of the newest capture
+CAPTURE_FLUSH_INTERVAL = 5.0
+
+_STOP = object()
+
+
+@dataclass(frozen=True, slots=True)
+class CapturedPacket:
+    """A datagram read back from a capture file."""
+
+    received: float
+    addr: tuple[str, int]
+    data: bytes
+
+
+class PacketRecorder:
+    """Write datagrams to rotating compressed files from a worker thread.
+
+    ``record`` only enqueues, so the event loop never waits for the disk.
+    When the writer falls behind by ``max_queue`` datagrams new ones are
+    dropped and counted, and after a write error recording stops.
+    A file is rotated once it holds ``max_bytes`` of uncompressed lines and
+    only the newest ``backup_count`` files are kept.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+        backup_count: int = CAPTURE_BACKUP_COUNT,
+        max_queue: int = CAPTURE_QUEUE_SIZE,
+        flush_interval: float = CAPTURE_FLUSH_INTERVAL,
+    ) -> None:
+        """Initialize the recorder."""
+        self.directory = directory
+        self._flush_interval = flush_interval
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._sequence = 0
+        # Datagrams dropped because the queue was full
+        self.dropped = 0
+        # Set by the writer thread when it exits on a write error
+        self.failed = False
+
+    def record(self, data: bytes, addr: tuple[str, int], received: float) -> None:
+        """Queue a datagram for writing, unless the writer cannot keep up."""
+        if self.failed:
+            return
+        try:
+            self._queue.put_nowait((received, addr, data))
+        except queue.Full:
+            if not self.dropped:
+                _LOGGER.warning("Datagram capture cannot keep up, dropping datagrams")
+            self.dropped += 1
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._run, name="earn_e_p1_capture", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Flush queued datagrams and stop the writer thread.
+
+        Blocks until the thread has exited; call it from an executor.
+        """
+        if self._thread is None:
+            return
+        # The writer may exit on an error while we wait for room
+        while self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=1)
+            except queue.Full:
+                continue
+            break
+        self._thread.join()
+        self._thread = None
+
+    def _open(self) -> gzip.GzipFile:
+        """Open a new capture file and prune the oldest ones."""
+        files = sorted(self.directory.glob(CAPTURE_GLOB))
+        for old in files[: max(len(files) - self._backup_count + 1, 0)]:
+            old.unlink(missing_ok=True)
+        self._sequence += 1
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        path = self.directory / f"earn_e_p1-{stamp}-{self._sequence:04d}.jsonl.gz"
+        _LOGGER.debug("Writing datagram capture to %s", path)
+        return gzip.GzipFile(path, "wb")
+
+    def _run(self) -> None:
+        """Drain the queue into capture files until stopped.
+
+        The stream is sync-flushed once the queue has been idle, or at the
+        latest every flush interval, so everything up to then can be read
+        back even if the file is never closed.
+        """
+        file: gzip.GzipFile | None = None
+        written = 0
+        # Whether lines were written since the last flush
+        dirty = False
+        flushed = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self._flush_interval)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    break
+                if (
+                    dirty
+                    and file is not None
+                    and (
+                        item is None
+                        or time.monotonic() - flushed >= self._flush_interval
+                    )
+                ):
+                    file.flush(zlib.Z_SYNC_FLUSH)
+                    flushed = time.monotonic()
+                    dirty = False
+                if item is None:
+                    continue
+                received, (host, port), data = item  # type: ignore[misc]
+                line = (
+                    json.dumps(
+                        {
+                            "t": received,
+                            "src": host,
+                            "port": port,
+                            "data": data.decode("latin-1"),
+                        },
+                        separators=(",", ":"),
+                    ).encode()
+                    + b"\n"
+                )
+                if file is None or written >= self._max_bytes:
+                    if file is not None:
+                        file.close()
+                    file = self._open()
+                    written = 0
+                file.write(line)
+                written += len(line)
+                dirty = True
+        except OSError:
+            self.failed = True
+            _LOGGER.exception("Datagram capture stopped after a write error")
+        finally:
+            if file is not None:
+                file.close()
+
+
+def read_capture(paths: Iterable[str | Path]) -> Iterator[CapturedPacket]:
+    """Yield the datagrams stored in capture files, in file order.
+
+    A file cut short, e.g. by a crash while it was written, yields its
+    complete lines and is then skipped.
+    """
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    if not line.endswith("\n"):
+                        break
+                    record = json.loads(line)
+                    yield CapturedPacket(
+                        received=record["t"],
+                        addr=(record["src"], record["port"]),
+                        data=record["data"].encode("latin-1"),
+                    )
+            except EOFError:
+                _LOGGER.warning("Capture %s is truncated", path)
+
+
+async def async_replay(
+    packets: Iterable[CapturedPacket],
+    protocol: asyncio.DatagramProtocol,
+    *,
+    speed: float = 1.0,
+    addr: tuple[str, int] | None = None,
+) -> int:
+    """Feed captured datagrams to a protocol and return the number sent.
+
+    Args:
+        packets: Datagrams to replay, typically from ``read_capture``.
+        protocol: Receives each datagram through ``datagram_received``.
+        speed: Playback speed; 1 keeps the original timing, 0 replays as
+            fast as the event loop allows.
+        addr: Source address to report instead of the captured one.
+
+    """
+    loop = asyncio.get_running_loop()
+    offset: float | None = None
+    count = 0
+    for packet in packets:
+        if speed > 0:
+            if offset is None:
+                offset = loop.time() - packet.received / speed
+            await asyncio.sleep(max(offset + packet.received / speed - loop.time(), 0))
+        else:
+            await asyncio.sleep(0)
+        protocol.datagram_received(packet.data, addr or packet.addr)
+        count += 1
+    return count
@@ -3,16 +3,44 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
 import voluptuous as vol
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST
-
-from .const import DEFAULT_PORT, DOMAIN
+from homeassistant.core import callback
+
+from .const import (
+    CONF_CAPTURE,
+    CONF_COALESCE_WINDOW,
+    CONF_DEADBAND_MODE,
+    CONF_DUPLICATE_WINDOW,
+    CONF_HISTORY_HOURS,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAX_SILENCE,
+    CONF_RECEIVE_BUFFER,
+    DEADBAND_MODE_ABSOLUTE,
+    DEADBAND_MODE_RELATIVE,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_DUPLICATE_WINDOW,
+    DEFAULT_HISTORY_HOURS,
+    DEFAULT_MAX_SILENCE,
+    DEFAULT_PORT,
+    DEFAULT_RECEIVE_BUFFER,
+    DOMAIN,
+    FILTERABLE_FIELDS,
+    MAX_HISTORY_HOURS,
+)
+from .decoder import DECODE_ERRORS, decode_payload
+from .listener import EarnEP1Listener, async_get_listener
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,17 +65,20 @@ class DeviceInfo:
 class _ListenProtocol(asyncio.DatagramProtocol):
     """UDP protocol that listens for EARN-E P1 packets.
 
-    Optionally filters by host and extracts serial number.
+    Optionally filters by host, skips devices the caller rejects and
+    extracts the serial number.
     """
 
     def __init__(
         self,
         future: asyncio.Future[DeviceInfo],
         host_filter: str | None = None,
+        skip: Callable[[str, str | None], bool] | None = None,
     ) -> None:
         """Initialize the listen protocol."""
         self.future = future
         self.host_filter = host_filter
+        self.skip = skip
 
     def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
         """Handle incoming UDP datagram."""
@@ -59,8 +90,8 @@ class _ListenProtocol(asyncio.DatagramProtocol):
             return
 
         try:
-            payload = json.loads(data)
-        except (json.JSONDecodeError, UnicodeDecodeError):
+            payload = decode_payload(data)
+        except DECODE_ERRORS:
             return
         if not isinstance(payload, dict):
             return
@@ -69,12 +100,11 @@ class _ListenProtocol(asyncio.DatagramProtocol):
         if "power_delivered" not in payload and "serial" not in payload:
             return
 
-        self.future.set_result(
-            DeviceInfo(
-                host=source_ip,
-                serial=payload.get("serial"),
-            )
-        )
+        serial = payload.get("serial")
+        if self.skip is not None and self.skip(source_ip, serial):
+            return
+
+        self.future.set_result(DeviceInfo(host=source_ip, serial=serial))
 
 
 class EarnEP1ConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -87,6 +117,12 @@ class EarnEP1ConfigFlow(ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._discovered_info: DeviceInfo | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> EarnEP1OptionsFlow:
+        """Return the options flow handler."""
+        return EarnEP1OptionsFlow()
+
     async def _async_listen_for_device(
         self,
         host_filter: str | None = None,
@@ -94,6 +130,9 @@ class EarnEP1ConfigFlow(ConfigFlow, domain=DOMAIN):
     ) -> DeviceInfo | None:
         """Listen for UDP packets and return device info.
 
+        While a meter is configured the shared listener's recently seen
+        devices answer immediately; otherwise wait for the next packet.
+
         Args:
             host_filter: Only accept packets from this IP address.
             timeout: Seconds to wait before giving up.
@@ -105,21 +144,60 @@ class EarnEP1ConfigFlow(ConfigFlow, domain=DOMAIN):
             OSError: If the UDP port cannot be opened.
 
         """
+        listener = async_get_listener(self.hass)
+        if listener is not None:
+            if (info := self._recent_device(listener, host_filter)) is not None:
+                return info
+
         loop = self.hass.loop
         found: asyncio.Future[DeviceInfo] = loop.create_future()
+        skip: Callable[[str, str | None], bool] | None = None
+        if host_filter is None:
+            configured = self._async_current_ids()
 
-        transport, _ = await loop.create_datagram_endpoint(
-            lambda: _ListenProtocol(found, host_filter),
-            local_addr=("0.0.0.0", DEFAULT_PORT),
-            allow_broadcast=True,
-        )
+            def skip(host: str, serial: str | None) -> bool:
+                """Return True for a meter that is already configured."""
+                return serial in configured or (
+                    listener is not None and listener.is_registered(host)
+                )
+
+        protocol = _ListenProtocol(found, host_filter, skip)
+
+        # A configured meter already holds the port; watch its traffic
+        if listener is not None:
+            stop = listener.async_add_monitor(protocol)
+        else:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: protocol,
+                local_addr=("0.0.0.0", DEFAULT_PORT),
+                allow_broadcast=True,
+            )
+            stop = transport.close
         try:
             async with asyncio.timeout(timeout):
                 return await found
         except TimeoutError:
             return None
         finally:
-            transport.close()
+            stop()
+
+    def _recent_device(
+        self, listener: EarnEP1Listener, host_filter: str | None
+    ) -> DeviceInfo | None:
+        """Return a device the shared listener heard from recently.
+
+        Discovery skips meters that are already configured; validation only
+        accepts the requested host.
+        """
+        configured = self._async_current_ids()
+        for seen in listener.recent_devices():
+            if host_filter is not None:
+                if seen.host != host_filter:
+                    continue
+            elif listener.is_registered(seen.host) or seen.serial in configured:
+                continue
+            return DeviceInfo(host=seen.host, serial=seen.serial)
+        return None
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -132,7 +210,7 @@ class EarnEP1ConfigFlow(ConfigFlow, domain=DOMAIN):
         try:
             info = await self._async_listen_for_device()
         except OSError:
-            # Port already in use (e.g. coordinator already listening)
+            # Port already in use by another process
             info = None
 
         if info:
@@ -227,14 +305,14 @@ class EarnEP1ConfigFlow(ConfigFlow, domain=DOMAIN):
         host = user_input[CONF_HOST]
         serial: str | None = None
 
-        # During reconfigure, the coordinator already holds the UDP port.
-        # If opening the port fails, skip validation (device already proven).
+        # Validation watches the shared listener while the entry is loaded.
+        # If the port cannot be opened, skip validation (device already proven).
         try:
             info = await self._async_listen_for_device(
                 host_filter=host, timeout=VALIDATION_TIMEOUT
             )
         except OSError:
-            # Port in use by the running coordinator — skip validation
+            # Port in use by another process — skip validation
             info = DeviceInfo(host=host, serial=None)
         except Exception:
             _LOGGER.exception("Unexpected error during reconfigure validation")
@@ -271,3 +349,66 @@ class EarnEP1ConfigFlow(ConfigFlow, domain=DOMAIN):
             data_updates={CONF_HOST: host, "serial": serial},
             unique_id=unique_id,
         )
+
+
+class EarnEP1OptionsFlow(OptionsFlow):
+    """Handle options for EARN-E P1 Meter."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the publish filter options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema: dict[vol.Marker, Any] = {
+            vol.Required(
+                CONF_DEADBAND_MODE,
+                default=options.get(CONF_DEADBAND_MODE, DEADBAND_MODE_ABSOLUTE),
+            ): vol.In([DEADBAND_MODE_ABSOLUTE, DEADBAND_MODE_RELATIVE]),
+            vol.Required(
+                CONF_MAX_SILENCE,
+                default=options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Required(
+                CONF_COALESCE_WINDOW,
+                default=options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+            vol.Required(
+                CONF_DUPLICATE_WINDOW,
+                default=options.get(CONF_DUPLICATE_WINDOW, DEFAULT_DUPLICATE_WINDOW),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5000)),
+            vol.Required(
+                CONF_RECEIVE_BUFFER,
+                default=options.get(CONF_RECEIVE_BUFFER, DEFAULT_RECEIVE_BUFFER),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=16 * 1024 * 1024)),
+            vol.Required(
+                CONF_HISTORY_HOURS,
+                default=options.get(CONF_HISTORY_HOURS, DEFAULT_HISTORY_HOURS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_HISTORY_HOURS)),
+            vol.Required(
+                CONF_LONG_TERM_STATISTICS,
+                default=options.get(CONF_LONG_TERM_STATISTICS, False),
+            ): bool,
+            vol.Required(CONF_CAPTURE, default=options.get(CONF_CAPTURE, False)): bool,
+        }
+        for field in FILTERABLE_FIELDS:
+            schema[
+                vol.Required(
+                    field.deadband_option,
+                    default=options.get(field.deadband_option, field.deadband),
+                )
+            ] = vol.All(vol.Coerce(float), vol.Range(min=0))
+            schema[
+                vol.Optional(
+                    field.precision_option,
+                    description={
+                        "suggested_value": options.get(
+                            field.precision_option, field.precision
+                        )
+                    },
+                )
+            ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=6))
+
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import timedelta
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -15,11 +16,71 @@ from homeassistant.const import (
     UnitOfEnergy,
     UnitOfPower,
     UnitOfVolume,
+    UnitOfVolumeFlowRate,
 )
 
 DOMAIN = "earn_e_p1"
 DEFAULT_PORT = 16121
 
+CONF_CAPTURE = "capture"
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_DEADBAND_MODE = "deadband_mode"
+CONF_DUPLICATE_WINDOW = "duplicate_window"
+CONF_HISTORY_HOURS = "history_hours"
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+CONF_MAX_SILENCE = "max_silence"
+CONF_RECEIVE_BUFFER = "receive_buffer"
+
+# Milliseconds to buffer datagrams before publishing; 0 flushes once per
+# event loop iteration
+DEFAULT_COALESCE_WINDOW = 0
+
+# Milliseconds within which an identical datagram is dropped as a repeat
+# (several interfaces, mesh WiFi); 0 disables duplicate suppression
+DEFAULT_DUPLICATE_WINDOW = 500
+# Hashes of recent datagrams remembered for duplicate suppression
+DUPLICATE_HISTORY = 8
+
+# Hours of realtime samples kept in memory (at one per second); 0 disables
+DEFAULT_HISTORY_HOURS = 6
+MAX_HISTORY_HOURS = 48
+
+# With long-term statistics imported directly, realtime sensors publish at
+# most once per this many seconds
+STATISTICS_PUBLISH_INTERVAL = 60
+
+# Event loop heartbeat: a beat running this many seconds late means the loop
+# is stalled, and datagrams are then coalesced latest-wins for
+# BACKPRESSURE_LAG seconds per publish until a beat is on time again
+HEARTBEAT_INTERVAL = 0.5
+BACKPRESSURE_LAG = 0.25
+
+# SO_RCVBUF size in bytes; 0 keeps the operating system default
+DEFAULT_RECEIVE_BUFFER = 0
+
+# Listener context and refresh interval of the diagnostic sensors; ingest
+# counters change on every packet, so they are pushed on a timer instead
+DIAGNOSTICS_CONTEXT = "diagnostics"
+DIAGNOSTICS_INTERVAL = timedelta(seconds=30)
+
+# Last-known telegram values are restored from this store at startup. Writes
+# are batched: at most one per STORAGE_SAVE_DELAY while packets arrive
+STORAGE_KEY = f"{DOMAIN}.{{entry_id}}"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Raw datagram captures are written below the config directory
+CAPTURE_DIRECTORY = "earn_e_p1_captures"
+
+DEADBAND_MODE_ABSOLUTE = "absolute"
+DEADBAND_MODE_RELATIVE = "relative"
+DEFAULT_MAX_SILENCE = 300
+
+# Seconds without a packet after which a field's sensor becomes unavailable.
+# Realtime values arrive about every second, full telegrams every minute
+REALTIME_STALE_AFTER = 30
+TELEGRAM_STALE_AFTER = 180
+
 
 @dataclass(frozen=True, kw_only=True)
 class P1SensorFieldDescriptor:
@@ -32,6 +93,33 @@ class P1SensorFieldDescriptor:
     device_class: SensorDeviceClass | None
     state_class: SensorStateClass | None
     realtime: bool
+    # Decoding: the JSON value is coerced to value_type, multiplied by scale
+    # and dropped when outside the plausibility bounds
+    value_type: type[float] | type[int] = float
+    scale: float = 1.0
+    minimum: float | None = None
+    maximum: float | None = None
+    # Largest plausible increase of a total per hour, in native units
+    max_rate: float | None = None
+    # Publish filtering defaults, overridable per field in the options flow.
+    # The deadband is in native units, or percent in relative mode.
+    deadband: float = 0.0
+    precision: int | None = None
+
+    @property
+    def deadband_option(self) -> str:
+        """Return the options key holding this field's deadband."""
+        return f"{self.key}_deadband"
+
+    @property
+    def precision_option(self) -> str:
+        """Return the options key holding this field's rounding precision."""
+        return f"{self.key}_precision"
+
+    @property
+    def stale_after(self) -> int:
+        """Return the seconds after which an unrefreshed value expires."""
+        return REALTIME_STALE_AFTER if self.realtime else TELEGRAM_STALE_AFTER
 
 
 SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
@@ -43,6 +131,8 @@ SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
         realtime=True,
+        minimum=0,
+        maximum=250,
     ),
     P1SensorFieldDescriptor(
         key="power_returned",
@@ -52,6 +142,8 @@ SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
         realtime=True,
+        minimum=0,
+        maximum=250,
     ),
     P1SensorFieldDescriptor(
         key="voltage_l1",
@@ -61,6 +153,8 @@ SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         realtime=True,
+        minimum=0,
+        maximum=400,
     ),
     P1SensorFieldDescriptor(
         key="current_l1",
@@ -70,6 +164,152 @@ SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
         realtime=True,
+        minimum=0,
+        maximum=250,
+    ),
+    P1SensorFieldDescriptor(
+        key="voltage_l2",
+        json_key="voltage_l2",
+        translation_key="voltage_l2",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        realtime=True,
+        minimum=0,
+        maximum=400,
+    ),
+    P1SensorFieldDescriptor(
+        key="voltage_l3",
+        json_key="voltage_l3",
+        translation_key="voltage_l3",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        realtime=True,
+        minimum=0,
+        maximum=400,
+    ),
+    P1SensorFieldDescriptor(
+        key="current_l2",
+        json_key="current_l2",
+        translation_key="current_l2",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        realtime=True,
+        minimum=0,
+        maximum=250,
+    ),
+    P1SensorFieldDescriptor(
+        key="current_l3",
+        json_key="current_l3",
+        translation_key="current_l3",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        realtime=True,
+        minimum=0,
+        maximum=250,
+    ),
+    P1SensorFieldDescriptor(
+        key="power_delivered_l1",
+        json_key="power_delivered_l1",
+        translation_key="power_delivered_l1",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        realtime=True,
+        minimum=0,
+        maximum=250,
+    ),
+    P1SensorFieldDescriptor(
+        key="power_delivered_l2",
+        json_key="power_delivered_l2",
+        translation_key="power_delivered_l2",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        realtime=True,
+        minimum=0,
+        maximum=250,
+    ),
+    P1SensorFieldDescriptor(
+        key="power_delivered_l3",
+        json_key="power_delivered_l3",
+        translation_key="power_delivered_l3",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        realtime=True,
+        minimum=0,
+        maximum=250,
+    ),
+    P1SensorFieldDescriptor(
+        key="power_returned_l1",
+        json_key="power_returned_l1",
+        translation_key="power_returned_l1",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        realtime=True,
+        minimum=0,
+        maximum=250,
+    ),
+    P1SensorFieldDescriptor(
+        key="power_returned_l2",
+        json_key="power_returned_l2",
+        translation_key="power_returned_l2",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        realtime=True,
+        minimum=0,
+        maximum=250,
+    ),
+    P1SensorFieldDescriptor(
+        key="power_returned_l3",
+        json_key="power_returned_l3",
+        translation_key="power_returned_l3",
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        realtime=True,
+        minimum=0,
+        maximum=250,
+    ),
+    P1SensorFieldDescriptor(
+        key="tariff",
+        json_key="tariff",
+        translation_key="tariff",
+        native_unit_of_measurement=None,
+        device_class=None,
+        state_class=None,
+        realtime=False,
+        value_type=int,
+        minimum=1,
+        maximum=2,
+    ),
+    P1SensorFieldDescriptor(
+        key="power_failures",
+        json_key="power_failures",
+        translation_key="power_failures",
+        native_unit_of_measurement=None,
+        device_class=None,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        realtime=False,
+        value_type=int,
+        minimum=0,
+    ),
+    P1SensorFieldDescriptor(
+        key="long_power_failures",
+        json_key="long_power_failures",
+        translation_key="long_power_failures",
+        native_unit_of_measurement=None,
+        device_class=None,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        realtime=False,
+        value_type=int,
+        minimum=0,
     ),
     P1SensorFieldDescriptor(
         key="energy_delivered_tariff1",
@@ -79,6 +319,8 @@ SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
         realtime=False,
+        minimum=0,
+        max_rate=250,
     ),
     P1SensorFieldDescriptor(
         key="energy_delivered_tariff2",
@@ -88,6 +330,8 @@ SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
         realtime=False,
+        minimum=0,
+        max_rate=250,
     ),
     P1SensorFieldDescriptor(
         key="energy_returned_tariff1",
@@ -97,6 +341,8 @@ SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
         realtime=False,
+        minimum=0,
+        max_rate=250,
     ),
     P1SensorFieldDescriptor(
         key="energy_returned_tariff2",
@@ -106,6 +352,8 @@ SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
         device_class=SensorDeviceClass.ENERGY,
         state_class=SensorStateClass.TOTAL_INCREASING,
         realtime=False,
+        minimum=0,
+        max_rate=250,
     ),
     P1SensorFieldDescriptor(
         key="gas_delivered",
@@ -115,6 +363,8 @@ SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
         device_class=SensorDeviceClass.GAS,
         state_class=SensorStateClass.TOTAL_INCREASING,
         realtime=False,
+        minimum=0,
+        max_rate=100,
     ),
     P1SensorFieldDescriptor(
         key="wifi_rssi",
@@ -124,5 +374,118 @@ SENSOR_FIELDS: tuple[P1SensorFieldDescriptor, ...] = (
         device_class=SensorDeviceClass.SIGNAL_STRENGTH,
         state_class=SensorStateClass.MEASUREMENT,
         realtime=False,
+        value_type=int,
+        minimum=-120,
+        maximum=0,
     ),
 )
+
+REALTIME_FIELDS: tuple[P1SensorFieldDescriptor, ...] = tuple(
+    field for field in SENSOR_FIELDS if field.realtime
+)
+
+# Only instantaneous measurements may be deadbanded; suppressing counter
+# increments would distort the energy statistics
+FILTERABLE_FIELDS: tuple[P1SensorFieldDescriptor, ...] = tuple(
+    field
+    for field in SENSOR_FIELDS
+    if field.state_class is SensorStateClass.MEASUREMENT
+)
+
+
+_FIELD_BY_KEY = {field.key: field for field in SENSOR_FIELDS}
+
+
+@dataclass(frozen=True, kw_only=True)
+class P1DerivedFieldDescriptor:
+    """Describes a value the coordinator derives from a realtime field.
+
+    Derived values are stored in the telegram state under their key and
+    are available while their source is. Unset unit and classes are taken
+    from the template field.
+    """
+
+    key: str
+    source: P1SensorFieldDescriptor
+    # Field whose unit and classes the value shares; defaults to the source
+    reference: P1SensorFieldDescriptor | None = None
+    native_unit_of_measurement: str | None = None
+    device_class: SensorDeviceClass | None = None
+    state_class: SensorStateClass | None = None
+
+    def __post_init__(self) -> None:
+        """Fill the unset unit and classes from the template field."""
+        for name in ("native_unit_of_measurement", "device_class", "state_class"):
+            if getattr(self, name) is None:
+                object.__setattr__(self, name, getattr(self.template, name))
+
+    @property
+    def template(self) -> P1SensorFieldDescriptor:
+        """Return the field whose unit and classes the value shares."""
+        return self.reference or self.source
+
+
+@dataclass(frozen=True, kw_only=True)
+class P1AverageFieldDescriptor(P1DerivedFieldDescriptor):
+    """Describes a tumbling average derived from a realtime field."""
+
+    # Window length in seconds; windows are aligned to the clock
+    window: int
+
+
+AVERAGE_FIELDS: tuple[P1AverageFieldDescriptor, ...] = tuple(
+    P1AverageFieldDescriptor(
+        key=f"{field.key}_average_{window // 60}m", source=field, window=window
+    )
+    for field in SENSOR_FIELDS
+    if field.key in ("power_delivered", "power_returned")
+    for window in (60, 900)
+)
+
+# Capacity tariff: running and projected quarter-hour average of delivered
+# power, and the highest completed quarter of the month
+PEAK_FIELDS: tuple[P1DerivedFieldDescriptor, ...] = tuple(
+    P1DerivedFieldDescriptor(key=key, source=_FIELD_BY_KEY["power_delivered"])
+    for key in (
+        "power_quarter_average",
+        "power_quarter_projected",
+        "power_month_peak",
+    )
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class P1InterpolatedFieldDescriptor(P1DerivedFieldDescriptor):
+    """Describes a meter reading extended by integrating a power field."""
+
+    # Tariff counters summed into the meter reading
+    counters: tuple[P1SensorFieldDescriptor, ...]
+
+
+# Meter readings (tariff 1 + 2) extended by integrating realtime power
+# between full telegrams
+INTERPOLATED_FIELDS: tuple[P1InterpolatedFieldDescriptor, ...] = tuple(
+    P1InterpolatedFieldDescriptor(
+        key=f"energy_{direction}_interpolated",
+        source=_FIELD_BY_KEY[f"power_{direction}"],
+        reference=_FIELD_BY_KEY[f"energy_{direction}_tariff1"],
+        counters=(
+            _FIELD_BY_KEY[f"energy_{direction}_tariff1"],
+            _FIELD_BY_KEY[f"energy_{direction}_tariff2"],
+        ),
+    )
+    for direction in ("delivered", "returned")
+)
+
+# Gas flow rate from the steps of the gas meter reading
+GAS_FLOW_FIELD = P1DerivedFieldDescriptor(
+    key="gas_flow",
+    source=_FIELD_BY_KEY["gas_delivered"],
+    native_unit_of_measurement=UnitOfVolumeFlowRate.CUBIC_METERS_PER_HOUR,
+    device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
+    state_class=SensorStateClass.MEASUREMENT,
+)
+
+DERIVED_FIELDS: tuple[P1DerivedFieldDescriptor, ...] = (
+    AVERAGE_FIELDS + PEAK_FIELDS + INTERPOLATED_FIELDS + (GAS_FLOW_FIELD,)
+)
@@ -3,40 +3,126 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import heapq
 import logging
+import time
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DEFAULT_PORT, DOMAIN
+from .averages import TumblingAverage
+from .capture import PacketRecorder
+from .const import (
+    AVERAGE_FIELDS,
+    BACKPRESSURE_LAG,
+    CAPTURE_DIRECTORY,
+    CONF_CAPTURE,
+    CONF_COALESCE_WINDOW,
+    CONF_DUPLICATE_WINDOW,
+    CONF_HISTORY_HOURS,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_RECEIVE_BUFFER,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_DUPLICATE_WINDOW,
+    DEFAULT_HISTORY_HOURS,
+    DEFAULT_RECEIVE_BUFFER,
+    DERIVED_FIELDS,
+    DIAGNOSTICS_CONTEXT,
+    DIAGNOSTICS_INTERVAL,
+    DOMAIN,
+    DUPLICATE_HISTORY,
+    GAS_FLOW_FIELD,
+    INTERPOLATED_FIELDS,
+    REALTIME_FIELDS,
+    SENSOR_FIELDS,
+    STATISTICS_PUBLISH_INTERVAL,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .deadband import DeadbandFilter
+from .decoder import DECODE_ERRORS, decode_payload
+from .gasflow import GasFlow
+from .history import SampleBuffer
+from .interpolation import EnergyInterpolator
+from .listener import EarnEP1Listener, async_acquire_listener, async_release_listener
+from .longterm import HourlyAggregator, async_import_hour
+from .peak import QuarterHourPeak
+from .schema import PayloadValidator, is_number
+from .stats import IngestStats, read_udp_drops
+from .telegram import TelegramState
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class EarnEP1UDPProtocol(asyncio.DatagramProtocol):
-    """UDP protocol that receives EARN-E P1 meter JSON packets."""
+    """UDP protocol that receives EARN-E P1 meter JSON packets.
 
-    def __init__(self, coordinator: EarnEP1Coordinator, host: str) -> None:
+    The shared listener only routes datagrams from the coordinator's host
+    here. Payloads are buffered and flushed to the coordinator once per event
+    loop iteration (or coalescing window), so a burst of datagrams costs a
+    single merge and listener fan-out. Later values win per key.
+
+    While the shared listener reports backpressure, flushes are delayed so the
+    backlog of a stalled event loop collapses into the newest realtime
+    sample and telegram, published once.
+    """
+
+    def __init__(
+        self,
+        coordinator: EarnEP1Coordinator,
+        listener: EarnEP1Listener | None = None,
+    ) -> None:
         """Initialize the protocol."""
         self.coordinator = coordinator
-        self.host = host
+        self._listener = listener
+        self._pending: dict[str, Any] = {}
+        self._flush_handle: asyncio.Handle | None = None
+        self._last_arrival: float | None = None
+        # Hash of each recent datagram and when it last arrived, oldest first
+        self._recent: dict[int, float] = {}
 
     def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
         """Handle incoming UDP datagram."""
-        source_ip = addr[0]
-        if source_ip != self.host:
+        start = time.perf_counter()
+        self._handle_datagram(data, addr, start)
+        self.coordinator.stats.handler_latency.add(time.perf_counter() - start)
+
+    def _handle_datagram(
+        self, data: bytes, addr: tuple[str, int], received: float
+    ) -> None:
+        """Decode a datagram and buffer its payload."""
+        stats = self.coordinator.stats
+        stats.received += 1
+        if (recorder := self.coordinator.packet_recorder) is not None:
+            recorder.record(data, addr, time.time())
+
+        if self._last_arrival is not None:
+            stats.inter_arrival.add(received - self._last_arrival)
+        self._last_arrival = received
+        if (window := self.coordinator.duplicate_window) and self._is_repeat(
+            data, received, window
+        ):
+            stats.duplicates += 1
             return
+
         try:
-            payload = json.loads(data)
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            _LOGGER.debug("Failed to decode UDP packet from %s", source_ip)
+            payload = decode_payload(data)
+        except DECODE_ERRORS:
+            stats.decode_errors += 1
+            _LOGGER.debug("Failed to decode UDP packet from %s", addr[0])
             return
 
         if not isinstance(payload, dict):
+            stats.non_dict += 1
             return
+        stats.accepted += 1
 
         # Extract device info from full telegrams (only set serial once
         # to keep device identifiers stable for the device registry)
@@ -47,22 +133,51 @@ class EarnEP1UDPProtocol(asyncio.DatagramProtocol):
         if "swVersion" in payload:
             self.coordinator.sw_version = str(payload["swVersion"])
 
-        # Merge new data into existing coordinator data
-        merged = dict(self.coordinator.data or {})
-        merged.update(payload)
-        self.coordinator.async_set_updated_data(merged)
+        backpressure = self._listener is not None and self._listener.backpressure
+        if backpressure and not self._pending.keys().isdisjoint(payload):
+            stats.superseded += 1
+        self._pending.update(payload)
+        if self._flush_handle is None:
+            loop = self.coordinator.hass.loop
+            window = self.coordinator.coalesce_window
+            if backpressure:
+                window = max(window, BACKPRESSURE_LAG)
+            if window:
+                self._flush_handle = loop.call_later(window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
 
-    def error_received(self, exc: Exception) -> None:
-        """Handle protocol errors."""
-        _LOGGER.error("UDP protocol error: %s", exc)
+    def _is_repeat(self, data: bytes, received: float, window: float) -> bool:
+        """Return True if the same datagram arrived within the window.
+
+        Hashing the bytes costs a fraction of decoding them. Only the last
+        DUPLICATE_HISTORY distinct datagrams are remembered.
+        """
+        digest = hash(data)
+        recent = self._recent
+        seen = recent.pop(digest, None)
+        recent[digest] = received
+        if len(recent) > DUPLICATE_HISTORY:
+            del recent[next(iter(recent))]
+        return seen is not None and received - seen <= window
+
+    def _flush(self) -> None:
+        """Publish the buffered payloads to the coordinator."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        start = time.perf_counter()
+        self.coordinator.async_set_updated_fields(pending)
+        self.coordinator.stats.publish_latency.add(time.perf_counter() - start)
 
     def connection_lost(self, exc: Exception | None) -> None:
-        """Handle connection lost."""
-        if exc:
-            _LOGGER.error("UDP connection lost: %s", exc)
+        """Drop buffered payloads when the protocol is unregistered."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending.clear()
 
 
-class EarnEP1Coordinator(DataUpdateCoordinator[dict[str, Any]]):
+class EarnEP1Coordinator(DataUpdateCoordinator[TelegramState]):
     """Coordinator for the EARN-E P1 Meter."""
 
     def __init__(
@@ -80,27 +195,419 @@ class EarnEP1Coordinator(DataUpdateCoordinator[dict[str, Any]]):
             config_entry=entry,
         )
         self.host = host
-        self.data = {}
+        self.data = TelegramState(field.json_key for field in SENSOR_FIELDS)
         self.serial: str | None = serial
         self.identifier: str = serial or entry.entry_id
         self.model: str | None = None
         self.sw_version: str | None = None
-        self._transport: asyncio.DatagramTransport | None = None
+        self._listener: EarnEP1Listener | None = None
+        self._unsub_listener: CALLBACK_TYPE | None = None
+        self._unsub_diagnostics: CALLBACK_TYPE | None = None
+        self._receive_buffer: int = entry.options.get(
+            CONF_RECEIVE_BUFFER, DEFAULT_RECEIVE_BUFFER
+        )
+        self.stats = IngestStats()
+        self._deadband = DeadbandFilter.from_options(entry.options)
+        self.packet_recorder: PacketRecorder | None = None
+        if entry.options.get(CONF_CAPTURE):
+            self.packet_recorder = PacketRecorder(
+                Path(hass.config.path(CAPTURE_DIRECTORY, self.identifier))
+            )
+        self.samples: SampleBuffer | None = None
+        if history_hours := entry.options.get(
+            CONF_HISTORY_HOURS, DEFAULT_HISTORY_HOURS
+        ):
+            self.samples = SampleBuffer(
+                (field.json_key for field in REALTIME_FIELDS), history_hours * 3600
+            )
+        self._realtime_keys = frozenset(field.json_key for field in REALTIME_FIELDS)
+        self._averages: tuple[tuple[str, str, TumblingAverage], ...] = tuple(
+            (field.source.json_key, field.key, TumblingAverage(field.window))
+            for field in AVERAGE_FIELDS
+        )
+        # Derived keys whose availability follows a source key
+        self._dependents: dict[str, list[str]] = {}
+        for field in DERIVED_FIELDS:
+            self._dependents.setdefault(field.source.json_key, []).append(field.key)
+        self.peak = QuarterHourPeak()
+        # (power key, counter keys, derived key, interpolator)
+        self.interpolators: tuple[
+            tuple[str, tuple[str, ...], str, EnergyInterpolator], ...
+        ] = tuple(
+            (
+                field.source.json_key,
+                tuple(counter.json_key for counter in field.counters),
+                field.key,
+                EnergyInterpolator(),
+            )
+            for field in INTERPOLATED_FIELDS
+        )
+        self.gas_flow = GasFlow()
+        # Long-term statistics mode: hourly rows are imported directly and
+        # realtime sensors are throttled to keep per-second states out of
+        # the recorder
+        self._aggregator: HourlyAggregator | None = None
+        if entry.options.get(CONF_LONG_TERM_STATISTICS):
+            self._aggregator = HourlyAggregator()
+        self._publish_realtime_at = 0.0
+        self.coalesce_window: float = (
+            entry.options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW) / 1000
+        )
+        self.duplicate_window: float = (
+            entry.options.get(CONF_DUPLICATE_WINDOW, DEFAULT_DUPLICATE_WINDOW) / 1000
+        )
+        # Listeners keyed by the JSON key they render, so a packet only
+        # wakes the entities whose value actually changed
+        self._field_listeners: dict[str, list[CALLBACK_TYPE]] = {
+            field.json_key: [] for field in SENSOR_FIELDS
+        }
+        # Loop time each JSON key was last received
+        self.field_updated: dict[str, float] = {}
+        self._validator = PayloadValidator(self.stats, self.field_updated)
+        # Keys restored from the store that no packet has confirmed yet
+        self.restored: set[str] = set()
+        # Staleness watchdog: one timer for the earliest entry of a heap of
+        # (expiry, key). Entries are refreshed lazily when the timer fires,
+        # so packets only touch the heap when an expired key comes back.
+        self.expired: set[str] = set()
+        self._stale_after: dict[str, float] = {
+            field.json_key: field.stale_after for field in SENSOR_FIELDS
+        }
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._stale_timer: asyncio.TimerHandle | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+        self._next_save = 0.0
+        # Keys seen in any payload, persisted so entities for the fields the
+        # meter actually sends exist from the start
+        self.discovered: set[str] = set()
+        self._discovery_listeners: list[Callable[[Iterable[str]], None]] = []
+
+    @callback
+    def async_add_discovery_listener(
+        self, discovery_callback: Callable[[Iterable[str]], None]
+    ) -> Callable[[], None]:
+        """Listen for keys that appear in the data for the first time."""
+        self._discovery_listeners.append(discovery_callback)
+
+        @callback
+        def remove_discovery_listener() -> None:
+            """Remove the discovery listener."""
+            self._discovery_listeners.remove(discovery_callback)
+
+        return remove_discovery_listener
+
+    @callback
+    def _async_discover(self, keys: Iterable[str]) -> None:
+        """Record keys not seen before and announce them."""
+        if not (new := set(keys).difference(self.discovered)):
+            return
+        self.discovered |= new
+        for discovery_callback in list(self._discovery_listeners):
+            discovery_callback(new)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, optionally for a single JSON key."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if context is None:
+            return remove_listener
+
+        listeners = self._field_listeners.setdefault(context, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_field_listener() -> None:
+            """Remove the listener from both registries."""
+            remove_listener()
+            listeners.remove(update_callback)
+
+        return remove_field_listener
+
+    @callback
+    def async_set_updated_data(self, data: Mapping[str, Any]) -> None:
+        """Replace the telegram state with data and notify all listeners."""
+        self.data.replace(data)
+        self._async_discover(data)
+        super().async_set_updated_data(self.data)
+
+    @callback
+    def async_set_updated_fields(self, payload: dict[str, Any]) -> None:
+        """Merge a payload into the data and notify only changed fields.
+
+        Values are first validated against the payload schema. Realtime
+        values then feed the history buffer, the averages and long-term
+        statistics unfiltered. In long-term statistics mode they are then
+        throttled, and values inside their configured deadband are dropped.
+        Listeners registered without a context are notified whenever any
+        field changed.
+        """
+        now = self.hass.loop.time()
+        payload = self._validator.apply(payload, self.data, now)
+        wall = time.time()
+        self.field_updated.update(dict.fromkeys(payload, now))
+        realtime = not self._realtime_keys.isdisjoint(payload)
+        if realtime and self.samples is not None:
+            self.samples.append(wall, payload)
+        payload = self._add_derived(wall, payload)
+        # Keys whose staleness changes even if their value does not
+        refreshed: set[str] = set()
+        if self.restored:
+            refreshed = self.restored.intersection(payload)
+            self.restored -= refreshed
+        if self.expired and (revived := self.expired.intersection(payload)):
+            self.expired -= revived
+            self._async_track_expiry(revived, now)
+            refreshed.update(self._with_dependents(revived))
+        if self._aggregator is not None:
+            if rows := self._aggregator.add(wall, payload):
+                async_import_hour(
+                    self.hass, self.identifier, self.config_entry.title, rows
+                )
+            if realtime:
+                if now < self._publish_realtime_at:
+                    payload = {
+                        key: value
+                        for key, value in payload.items()
+                        if key not in self._realtime_keys
+                    }
+                else:
+                    self._publish_realtime_at = now + STATISTICS_PUBLISH_INTERVAL
+        if self._deadband:
+            payload = self._deadband.apply(payload, self.data, now)
+        changed = self.data.update(payload)
+        if refreshed:
+            changed.extend(refreshed.difference(changed))
+        if not changed:
+            return
+
+        self.last_update_success = True
+        # New keys always count as changed
+        if not self.discovered.issuperset(changed):
+            self._async_discover(changed)
+        self._async_update_field_listeners(changed)
+        if now >= self._next_save:
+            self._next_save = now + STORAGE_SAVE_DELAY
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    def _with_dependents(self, keys: Iterable[str]) -> list[str]:
+        """Return keys followed by the derived keys that depend on them."""
+        result = list(keys)
+        for key in list(result):
+            result.extend(self._dependents.get(key, ()))
+        return result
+
+    def _add_derived(self, wall: float, payload: dict[str, Any]) -> dict[str, Any]:
+        """Feed the derived value engines and add their results.
+
+        Full telegrams re-anchor the interpolated energy counters and feed
+        the gas flow; realtime power feeds the averages, the peak engine and
+        the interpolation.
+        """
+        derived: dict[str, float | None] = {}
+        for power_key, counter_keys, key, interpolator in self.interpolators:
+            if any(counter in payload for counter in counter_keys):
+                reading = self._meter_reading(payload, counter_keys)
+                if reading is not None:
+                    derived[key] = interpolator.anchor(reading)
+            power = payload.get(power_key)
+            if is_number(power):
+                if (value := interpolator.add(wall, power)) is not None:
+                    derived[key] = value
+        for source, key, average in self._averages:
+            value = payload.get(source)
+            if not is_number(value):
+                continue
+            if (mean := average.add(wall, value)) is not None:
+                derived[key] = round(mean, 3)
+        power = payload.get("power_delivered")
+        if is_number(power):
+            derived.update(self.peak.add(wall, power))
+        gas = payload.get(GAS_FLOW_FIELD.source.json_key)
+        if is_number(gas):
+            # An unknown flow only clears a published (or restored) one
+            flow = self.gas_flow.add(wall, gas)
+            if flow is not None or GAS_FLOW_FIELD.key in self.data:
+                derived[GAS_FLOW_FIELD.key] = flow
+        return {**payload, **derived} if derived else payload
+
+    def _meter_reading(
+        self, payload: Mapping[str, Any], counter_keys: tuple[str, ...]
+    ) -> float | None:
+        """Return the sum of the tariff counters, preferring the payload."""
+        total = 0.0
+        for counter in counter_keys:
+            value = payload.get(counter, self.data.get(counter))
+            if not is_number(value):
+                return None
+            total += value
+        return total
+
+    @callback
+    def _async_update_field_listeners(self, keys: list[str]) -> None:
+        """Notify the listeners of the given keys and all context-less ones."""
+        for key in keys:
+            for update_callback in self._field_listeners.get(key, ()):
+                update_callback()
+        for update_callback, context in list(self._listeners.values()):
+            if context is None:
+                update_callback()
+
+    @callback
+    def _async_track_expiry(self, keys: Iterable[str], now: float) -> None:
+        """Schedule expiry checks for keys received at now."""
+        heap = self._expiry_heap
+        for key in keys:
+            if (stale_after := self._stale_after.get(key)) is not None:
+                heapq.heappush(heap, (now + stale_after, key))
+        if heap and (
+            self._stale_timer is None or self._stale_timer.when() > heap[0][0]
+        ):
+            if self._stale_timer is not None:
+                self._stale_timer.cancel()
+            self._stale_timer = self.hass.loop.call_at(
+                heap[0][0], self._async_check_stale
+            )
+
+    @callback
+    def _async_start_expiry(self) -> None:
+        """Track every field from its last (possibly restored) update."""
+        now = self.hass.loop.time()
+        for key in self._stale_after:
+            self._async_track_expiry((key,), self.field_updated.get(key, now))
+
+    @callback
+    def _async_check_stale(self) -> None:
+        """Expire fields that were not received in time."""
+        self._stale_timer = None
+        now = self.hass.loop.time()
+        heap = self._expiry_heap
+        expired: list[str] = []
+        while heap and heap[0][0] <= now:
+            _, key = heapq.heappop(heap)
+            expires = self.field_updated.get(key, 0.0) + self._stale_after[key]
+            if expires > now:
+                heapq.heappush(heap, (expires, key))
+            else:
+                expired.append(key)
+        if expired:
+            self.expired.update(expired)
+            _LOGGER.debug("No recent values from %s for %s", self.host, expired)
+            self._async_update_field_listeners(self._with_dependents(expired))
+        self._async_track_expiry((), now)
+
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the last-known telegram and receive times to persist."""
+        offset = time.time() - self.hass.loop.time()
+        data = {
+            "values": self.data.snapshot(),
+            "updated": {key: t + offset for key, t in self.field_updated.items()},
+            "peak": self.peak.as_dict(),
+            "discovered": sorted(self.discovered),
+        }
+        if self._aggregator is not None:
+            data["hourly"] = self._aggregator.as_dict()
+        return data
+
+    async def async_restore(self) -> None:
+        """Seed the data with the last-known telegram from the store.
+
+        Restored keys stay in ``restored`` until a packet confirms them, and
+        keep the age they had when stored, so values older than their stale
+        time expire as soon as the coordinator starts.
+        """
+        if not (stored := await self._store.async_load()):
+            return
+        values: dict[str, Any] = stored["values"]
+        self.data.update(values)
+        now = self.hass.loop.time()
+        offset = time.time() - now
+        updated: dict[str, float] = stored.get("updated", {})
+        self.field_updated.update(
+            {
+                key: min(now, updated[key] - offset) if key in updated else now
+                for key in values
+            }
+        )
+        self.restored.update(values)
+        self.discovered.update(stored.get("discovered", values))
+        # Continue from the meter reading, but never publish below a
+        # restored interpolated value
+        for _, counter_keys, key, interpolator in self.interpolators:
+            if (reading := self._meter_reading(values, counter_keys)) is not None:
+                interpolator.anchor(reading)
+            if is_number(published := values.get(key)):
+                interpolator.hold(published)
+        if "peak" in stored:
+            self.peak.restore(stored["peak"])
+        if self._aggregator is not None and "hourly" in stored:
+            self._aggregator.restore(stored["hourly"])
+        self.model = values.get("model")
+        if "swVersion" in values:
+            self.sw_version = str(values["swVersion"])
+        _LOGGER.debug("Restored %s values for %s", len(values), self.host)
+
+    async def _async_refresh_diagnostics(self, _now: Any = None) -> None:
+        """Push the latest ingest statistics to the diagnostic sensors."""
+        if (listener := self._listener) is not None:
+            if listener.socket_inode is not None:
+                self.stats.kernel_drops = await self.hass.async_add_executor_job(
+                    read_udp_drops, listener.socket_inode
+                )
+        for update_callback in self._field_listeners.get(DIAGNOSTICS_CONTEXT, ()):
+            update_callback()
 
     async def async_start(self) -> None:
-        """Start listening for UDP packets."""
-        loop = self.hass.loop
-        transport, _ = await loop.create_datagram_endpoint(
-            lambda: EarnEP1UDPProtocol(self, self.host),
-            local_addr=("0.0.0.0", DEFAULT_PORT),
-            allow_broadcast=True,
+        """Start receiving UDP packets through the shared listener.
+
+        Raises:
+            OSError: If the UDP port cannot be opened.
+            ValueError: If another entry already receives from this host.
+
+        """
+        listener = await async_acquire_listener(self.hass)
+        try:
+            self._unsub_listener = listener.async_register(
+                self.host, EarnEP1UDPProtocol(self, listener)
+            )
+        except ValueError:
+            async_release_listener(self.hass, listener)
+            raise
+        self._listener = listener
+        if self._receive_buffer:
+            listener.request_receive_buffer(self._receive_buffer)
+
+        if self.packet_recorder is not None:
+            await self.hass.async_add_executor_job(self.packet_recorder.start)
+            _LOGGER.info(
+                "Capturing EARN-E datagrams to %s", self.packet_recorder.directory
+            )
+
+        self._unsub_diagnostics = async_track_time_interval(
+            self.hass, self._async_refresh_diagnostics, DIAGNOSTICS_INTERVAL
         )
-        self._transport = transport
-        _LOGGER.debug("UDP listener started on port %s", DEFAULT_PORT)
+        self._async_start_expiry()
 
     async def async_stop(self) -> None:
-        """Stop listening for UDP packets."""
-        if self._transport:
-            self._transport.close()
-            self._transport = None
-            _LOGGER.debug("UDP listener stopped")
+        """Stop receiving UDP packets."""
+        if self._stale_timer is not None:
+            self._stale_timer.cancel()
+            self._stale_timer = None
+        self._expiry_heap.clear()
+        if self._unsub_diagnostics:
+            self._unsub_diagnostics()
+            self._unsub_diagnostics = None
+        if self._unsub_listener:
+            self._unsub_listener()
+            self._unsub_listener = None
+        if (listener := self._listener) is not None:
+            self._listener = None
+            async_release_listener(self.hass, listener)
+        if self.packet_recorder is not None:
+            await self.hass.async_add_executor_job(self.packet_recorder.stop)
+        if self.data:
+            await self._store.async_save(self._data_to_store())
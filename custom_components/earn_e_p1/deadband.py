@@ -0,0 +1,107 @@
+"""Deadband and quantization of P1 values before they are published."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    CONF_DEADBAND_MODE,
+    CONF_MAX_SILENCE,
+    DEADBAND_MODE_RELATIVE,
+    DEFAULT_MAX_SILENCE,
+    FILTERABLE_FIELDS,
+)
+from .schema import is_number
+
+
+@dataclass(frozen=True, slots=True)
+class FieldDeadband:
+    """Publish filter settings for a single JSON key."""
+
+    threshold: float
+    precision: int | None
+
+
+class DeadbandFilter:
+    """Suppress publishes whose change is below a per-field threshold.
+
+    A suppressed value is still published once the field has been silent
+    for ``max_silence`` seconds, so slow drift eventually shows up. A value
+    this filter has not published yet (restored, or published before an
+    options reload) counts as silent for ever.
+    """
+
+    def __init__(
+        self,
+        settings: dict[str, FieldDeadband],
+        *,
+        relative: bool = False,
+        max_silence: float = DEFAULT_MAX_SILENCE,
+    ) -> None:
+        """Initialize the filter."""
+        self._settings = settings
+        self._relative = relative
+        self._max_silence = max_silence
+        self._published_at: dict[str, float] = {}
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> DeadbandFilter:
+        """Build a filter from config entry options and field defaults."""
+        settings: dict[str, FieldDeadband] = {}
+        for field in FILTERABLE_FIELDS:
+            threshold = float(options.get(field.deadband_option, field.deadband))
+            precision = options.get(field.precision_option, field.precision)
+            if threshold or precision is not None:
+                settings[field.json_key] = FieldDeadband(
+                    threshold=threshold,
+                    precision=None if precision is None else int(precision),
+                )
+        return cls(
+            settings,
+            relative=options.get(CONF_DEADBAND_MODE) == DEADBAND_MODE_RELATIVE,
+            max_silence=options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE),
+        )
+
+    def __bool__(self) -> bool:
+        """Return True if any field is filtered."""
+        return bool(self._settings)
+
+    def apply(
+        self, payload: dict[str, Any], data: Mapping[str, Any], now: float
+    ) -> dict[str, Any]:
+        """Return the payload with values rounded and sub-threshold changes removed.
+
+        Args:
+            payload: Newly received values keyed by JSON key.
+            data: The currently published values.
+            now: Monotonic timestamp of the payload.
+
+        """
+        result: dict[str, Any] = {}
+        for key, value in payload.items():
+            setting = self._settings.get(key)
+            if setting is None or not is_number(value):
+                result[key] = value
+                continue
+
+            if setting.precision is not None:
+                value = round(value, setting.precision)
+
+            previous = data.get(key)
+            if (
+                setting.threshold
+                and isinstance(previous, (int, float))
+                and now - self._published_at.get(key, -math.inf) < self._max_silence
+            ):
+                limit = setting.threshold
+                if self._relative:
+                    limit = abs(previous) * setting.threshold / 100
+                if abs(value - previous) < limit:
+                    continue
+
+            self._published_at[key] = now
+            result[key] = value
+        return result
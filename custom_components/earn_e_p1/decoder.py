@@ -0,0 +1,30 @@
+"""JSON decoding for EARN-E P1 datagrams.
+
+orjson ships with Home Assistant and decodes a realtime packet several
+times faster than the standard library, so it is preferred whenever it
+can be imported. Available decoders are registered in ``DECODERS`` so the
+benchmarks can compare them.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+type Decoder = Callable[[bytes], Any]
+
+# Errors raised by any registered decoder for malformed datagrams
+DECODE_ERRORS: tuple[type[Exception], ...] = (json.JSONDecodeError, UnicodeDecodeError)
+
+DECODERS: dict[str, Decoder] = {"json": json.loads}
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a Home Assistant dependency
+    pass
+else:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    DECODERS["orjson"] = orjson.loads
+
+decode_payload: Decoder = DECODERS.get("orjson", json.loads)
@@ -0,0 +1,44 @@
+"""Diagnostics support for the EARN-E P1 Meter integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from . import EarnEP1ConfigEntry
+from .listener import async_get_listener
+
+TO_REDACT = {CONF_HOST, "serial", "unique_id", "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: EarnEP1ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
+    listener = async_get_listener(hass)
+    recorder = coordinator.packet_recorder
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "device": {
+            "model": coordinator.model,
+            "sw_version": coordinator.sw_version,
+        },
+        "data": async_redact_data(coordinator.data.snapshot(), TO_REDACT),
+        "ingest": coordinator.stats.as_dict(),
+        # Shared by all entries
+        "listener": None
+        if listener is None
+        else {"unrouted": listener.unrouted, "loop_lag": listener.loop_lag.as_dict()},
+        "capture": None
+        if recorder is None
+        else {"dropped": recorder.dropped, "failed": recorder.failed},
+        "peak": coordinator.peak.as_dict(),
+        "interpolation": {
+            key: interpolator.as_dict()
+            for _, _, key, interpolator in coordinator.interpolators
+        },
+    }
@@ -0,0 +1,47 @@
+"""Gas flow rate derived from the gas meter reading for the EARN-E P1 Meter.
+
+The gas meter reports its total in steps (every five minutes on DSMR 5,
+every hour on older meters), so the telegram value plateaus between steps.
+The flow is the volume of a step over the time since the previous step.
+"""
+
+from __future__ import annotations
+
+
+class GasFlow:
+    """Flow rate in m³/h from successive gas meter readings.
+
+    The first step after startup or a reset only starts the clock, as the
+    time the counter spent on its previous value is unknown. On a plateau
+    the flow is capped by the rate the last step would imply if the next
+    one arrived now, so it decays towards zero when gas use stops.
+    """
+
+    __slots__ = ("_changed_at", "_flow", "_reading", "_step")
+
+    def __init__(self) -> None:
+        """Initialize an engine without readings."""
+        self._reading: float | None = None
+        # Time of the last step, once one has been seen
+        self._changed_at: float | None = None
+        self._step = 0.0
+        self._flow: float | None = None
+
+    def add(self, timestamp: float, reading: float) -> float | None:
+        """Feed a reading in m³ and return the flow in m³/h, if known."""
+        if self._reading is None or reading < self._reading:
+            # First reading, or a meter reset or replacement
+            self._reading = reading
+            self._changed_at = None
+            self._flow = None
+            return None
+        if reading > self._reading:
+            if self._changed_at is not None and timestamp > self._changed_at:
+                self._step = reading - self._reading
+                self._flow = self._step * 3600 / (timestamp - self._changed_at)
+            self._reading = reading
+            self._changed_at = timestamp
+        elif self._flow is not None and self._changed_at is not None:
+            if (elapsed := timestamp - self._changed_at) > 0:
+                self._flow = min(self._flow, self._step * 3600 / elapsed)
+        return None if self._flow is None else round(self._flow, 3)
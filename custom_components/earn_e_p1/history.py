@@ -0,0 +1,122 @@
+"""Fixed-size in-memory history of realtime samples for the EARN-E P1 Meter."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Iterable, Mapping
+from itertools import groupby
+from typing import Any
+
+# float32 columns carry about seven significant digits; more is noise
+_DIGITS = 3
+
+
+def _clean(values: Iterable[float]) -> list[float | None]:
+    """Round float32 values and turn NaN (missing) into None."""
+    return [None if math.isnan(value) else round(value, _DIGITS) for value in values]
+
+
+class SampleBuffer:
+    """Ring buffer of timestamped samples stored column-wise in arrays.
+
+    Timestamps are float64 seconds since the epoch and values float32, so a
+    sample of four fields takes 24 bytes and the buffer never grows after
+    construction. Missing values are stored as NaN.
+    """
+
+    __slots__ = ("_columns", "_count", "_next", "_times", "capacity")
+
+    def __init__(self, keys: Iterable[str], capacity: int) -> None:
+        """Allocate an empty buffer for capacity samples of the given keys."""
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._columns: dict[str, array[float]] = {
+            key: array("f", [math.nan]) * capacity for key in keys
+        }
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    def append(self, timestamp: float, values: Mapping[str, Any]) -> None:
+        """Store a sample, overwriting the oldest one when full."""
+        index = self._next
+        self._times[index] = timestamp
+        for key, column in self._columns.items():
+            value = values.get(key)
+            column[index] = value if isinstance(value, (int, float)) else math.nan
+        self._next = (index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def _bisect(self, timestamp: float, *, right: bool = False) -> int:
+        """Return the logical position of timestamp among the samples."""
+        times = self._times
+        first = self._next - self._count
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = times[(first + mid) % self.capacity]
+            if value < timestamp or (right and value == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _slice(self, column: array[Any], start: int, stop: int) -> array[Any]:
+        """Return logical positions start..stop of a column in order."""
+        first = (self._next - self._count + start) % self.capacity
+        last = first + stop - start
+        if last <= self.capacity:
+            return column[first:last]
+        return column[first:] + column[: last - self.capacity]
+
+    def query(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        bucket: float | None = None,
+    ) -> dict[str, Any]:
+        """Return the samples between start and end, column-wise.
+
+        With a bucket size in seconds, each column holds the min, max and
+        mean of the samples in consecutive buckets instead of raw values.
+        """
+        lo = 0 if start is None else self._bisect(start)
+        hi = self._count if end is None else self._bisect(end, right=True)
+        hi = max(lo, hi)
+        times = self._slice(self._times, lo, hi)
+        columns = {
+            key: self._slice(column, lo, hi) for key, column in self._columns.items()
+        }
+        if not bucket:
+            return {
+                "time": times.tolist(),
+                **{key: _clean(column) for key, column in columns.items()},
+            }
+
+        result: dict[str, Any] = {
+            "time": [],
+            **{key: {"min": [], "max": [], "mean": []} for key in columns},
+        }
+        for slot, positions in groupby(
+            range(len(times)), key=lambda i: times[i] // bucket
+        ):
+            group = list(positions)
+            result["time"].append(slot * bucket)
+            for key, column in columns.items():
+                values = [v for i in group if not math.isnan(v := column[i])]
+                stats = result[key]
+                if values:
+                    mean = math.fsum(values) / len(values)
+                    stats["min"].append(round(min(values), _DIGITS))
+                    stats["max"].append(round(max(values), _DIGITS))
+                    stats["mean"].append(round(mean, _DIGITS))
+                else:
+                    stats["min"].append(None)
+                    stats["max"].append(None)
+                    stats["mean"].append(None)
+        return result
@@ -0,0 +1,66 @@
+"""Energy counters interpolated between full telegrams for the EARN-E P1 Meter."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Longer gaps between power samples are not integrated
+MAX_GAP = 60
+
+
+class EnergyInterpolator:
+    """Meter reading extended by integrating realtime power.
+
+    Each full telegram re-anchors the value to the meter's own counter; the
+    difference to the interpolated value at that moment is kept as drift.
+    The published value never decreases, so a re-anchor below it holds the
+    value until the integration catches up instead of looking like a reset.
+    """
+
+    __slots__ = ("_anchor", "_energy", "_last", "_published", "drift", "max_drift")
+
+    def __init__(self) -> None:
+        """Initialize an interpolator without a reading."""
+        self._anchor: float | None = None
+        # kWh integrated since the anchor
+        self._energy = 0.0
+        self._last: tuple[float, float] | None = None
+        self._published: float | None = None
+        self.drift: float | None = None
+        self.max_drift = 0.0
+
+    def anchor(self, reading: float) -> float:
+        """Re-anchor to an authoritative reading in kWh and return the value."""
+        if self._anchor is not None:
+            self.drift = self._anchor + self._energy - reading
+            self.max_drift = max(self.max_drift, abs(self.drift))
+        self._anchor = reading
+        self._energy = 0.0
+        return self._publish(reading)
+
+    def hold(self, value: float) -> None:
+        """Never publish below value, e.g. one published before a restart."""
+        if self._published is None or value > self._published:
+            self._published = value
+
+    def add(self, timestamp: float, power: float) -> float | None:
+        """Integrate a power sample in kW and return the value, if anchored."""
+        if self._last is not None:
+            last_time, last_power = self._last
+            if 0 < (elapsed := timestamp - last_time) <= MAX_GAP:
+                self._energy += (last_power + power) / 2 * elapsed / 3600
+        self._last = (timestamp, power)
+        if self._anchor is None:
+            return None
+        return self._publish(self._anchor + self._energy)
+
+    def _publish(self, value: float) -> float:
+        """Return value rounded to 0.1 Wh, never below the last published."""
+        if self._published is not None and value < self._published:
+            value = self._published
+        self._published = value
+        return round(value, 4)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the drift statistics for diagnostics."""
+        return {"drift": self.drift, "max_drift": self.max_drift}
@@ -0,0 +1,346 @@
+"""Shared UDP listener for all EARN-E P1 Meter config entries.
+
+Every EARN-E broadcasts to the same port, so a single socket is opened per
+Home Assistant instance and shared by all coordinators. Each datagram is
+routed to the protocol registered for its source IP with one dict lookup.
+asyncio reads a single datagram per readiness event, so the listener drains
+whatever else the kernel has queued right away; the protocols then publish
+the whole batch with one flush.
+The listener also remembers which devices it has heard from recently, so the
+config flow can answer without opening a socket of its own, and runs the
+event loop heartbeat that tells the protocols when to coalesce harder.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass, field
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import BACKPRESSURE_LAG, DEFAULT_PORT, DOMAIN, HEARTBEAT_INTERVAL
+from .decoder import DECODE_ERRORS, decode_payload
+from .stats import LOOP_LAG_BUCKETS, Histogram
+
+_LOGGER = logging.getLogger(__name__)
+
+# Full telegrams (which carry the serial) arrive about once a minute
+RECENT_DEVICE_MAX_AGE = 65
+# Devices remembered at most; the least recently heard is evicted first
+MAX_RECENT_DEVICES = 32
+# Queued datagrams read per readiness event, so a flood cannot starve the
+# event loop
+MAX_DRAIN = 64
+MAX_DATAGRAM_SIZE = 65536
+
+
+@dataclass(slots=True)
+class SeenDevice:
+    """An EARN-E device the listener has received datagrams from."""
+
+    host: str
+    serial: str | None
+    last_seen: float
+
+
+class EarnEP1Listener(asyncio.DatagramProtocol):
+    """UDP endpoint that dispatches datagrams by source IP."""
+
+    def __init__(self) -> None:
+        """Initialize the listener."""
+        self.transport: asyncio.DatagramTransport | None = None
+        self.socket_inode: int | None = None
+        # Duplicate of the transport's socket to drain it with; asyncio's
+        # socket wrapper cannot receive
+        self._reader: socket.socket | None = None
+        # Datagrams from a source without a registered protocol; the socket
+        # is shared, so this is reported once for the listener
+        self.unrouted = 0
+        # How late the event loop heartbeat ran, and whether it is running
+        # late now; one heartbeat serves every protocol
+        self.loop_lag = Histogram(LOOP_LAG_BUCKETS)
+        self.backpressure = False
+        self._heartbeat: asyncio.TimerHandle | None = None
+        self._handlers: dict[str, asyncio.DatagramProtocol] = {}
+        self._monitors: list[asyncio.DatagramProtocol] = []
+        self._recent: dict[str, SeenDevice] = {}
+        self._receive_buffer = 0
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport and the socket to drain."""
+        self.transport = transport  # type: ignore[assignment]
+        if (sock := transport.get_extra_info("socket")) is not None:
+            self._reader = sock.dup()
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Route a datagram and the rest of the socket's queue."""
+        self._route(data, addr)
+        if (reader := self._reader) is None:
+            return
+        for _ in range(MAX_DRAIN):
+            try:
+                data, addr = reader.recvfrom(MAX_DATAGRAM_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:
+                self.error_received(exc)
+                return
+            self._route(data, addr)
+
+    def _route(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Route an incoming datagram to the protocol for its source."""
+        host = addr[0]
+        handler = self._handlers.get(host)
+        seen = self._recent.get(host)
+        if seen is not None and (seen.serial is not None or handler is not None):
+            seen.last_seen = time.monotonic()
+        elif handler is None:
+            self._remember(host, seen, data)
+        if self._monitors:
+            for monitor in list(self._monitors):
+                monitor.datagram_received(data, addr)
+        if handler is None:
+            self.unrouted += 1
+            return
+        handler.datagram_received(data, addr)
+
+    def _remember(self, host: str, seen: SeenDevice | None, data: bytes) -> None:
+        """Record an unconfigured device until its serial is known.
+
+        Configured meters are not decoded here; their coordinator does.
+        Other datagrams are only decoded when they may carry what is still
+        missing: the serial, or for a new host its first reading. Traffic
+        from other broadcasters therefore rarely reaches the decoder.
+        """
+        if b'"serial"' not in data and (
+            seen is not None or b'"power_delivered"' not in data
+        ):
+            if seen is not None:
+                seen.last_seen = time.monotonic()
+            return
+        try:
+            payload = decode_payload(data)
+        except DECODE_ERRORS:
+            return
+        if not isinstance(payload, dict):
+            return
+        if "power_delivered" not in payload and "serial" not in payload:
+            return
+        now = time.monotonic()
+        if seen is not None:
+            seen.serial = payload.get("serial")
+            seen.last_seen = now
+            return
+        self._prune(now)
+        self._recent[host] = SeenDevice(host, payload.get("serial"), now)
+
+    def _prune(self, now: float) -> None:
+        """Forget devices not heard from recently, keeping room for one more."""
+        recent = self._recent
+        cutoff = now - RECENT_DEVICE_MAX_AGE
+        for host in [host for host, seen in recent.items() if seen.last_seen < cutoff]:
+            del recent[host]
+        while len(recent) >= MAX_RECENT_DEVICES:
+            oldest = min(recent.values(), key=lambda seen: seen.last_seen)
+            del recent[oldest.host]
+
+    def recent_devices(
+        self, max_age: float = RECENT_DEVICE_MAX_AGE
+    ) -> list[SeenDevice]:
+        """Return devices heard from within max_age seconds, newest first."""
+        cutoff = time.monotonic() - max_age
+        return sorted(
+            (seen for seen in self._recent.values() if seen.last_seen >= cutoff),
+            key=lambda seen: seen.last_seen,
+            reverse=True,
+        )
+
+    def is_registered(self, host: str) -> bool:
+        """Return True if a config entry receives datagrams from host."""
+        return host in self._handlers
+
+    @callback
+    def async_start_heartbeat(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start measuring how late the event loop runs."""
+        if self._heartbeat is None:
+            self._async_heartbeat(loop, loop.time())
+
+    @callback
+    def _async_heartbeat(self, loop: asyncio.AbstractEventLoop, due: float) -> None:
+        """Measure how late the loop ran this beat and schedule the next."""
+        now = loop.time()
+        lag = max(0.0, now - due)
+        self.loop_lag.add(lag)
+        if (backpressure := lag > BACKPRESSURE_LAG) != self.backpressure:
+            self.backpressure = backpressure
+            _LOGGER.debug(
+                "Event loop %s (%.3f s late)",
+                "stalled, coalescing datagrams" if backpressure else "recovered",
+                lag,
+            )
+        due = now + HEARTBEAT_INTERVAL
+        self._heartbeat = loop.call_at(due, self._async_heartbeat, loop, due)
+
+    def _stop_heartbeat(self) -> None:
+        """Stop the event loop heartbeat."""
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+
+    def error_received(self, exc: Exception) -> None:
+        """Handle protocol errors."""
+        _LOGGER.error("UDP protocol error: %s", exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Handle connection lost.
+
+        The listener is dead from here on; the next acquisition replaces it.
+        """
+        self.transport = None
+        self._close_reader()
+        self._stop_heartbeat()
+        for handler in self._handlers.values():
+            handler.connection_lost(exc)
+        if exc:
+            _LOGGER.error("UDP connection lost: %s", exc)
+
+    @callback
+    def async_register(
+        self, host: str, handler: asyncio.DatagramProtocol
+    ) -> CALLBACK_TYPE:
+        """Route datagrams from host to handler until the callback is called.
+
+        Raises:
+            ValueError: If another handler is already registered for host.
+
+        """
+        if host in self._handlers:
+            raise ValueError(f"A meter at {host} is already registered")
+        self._handlers[host] = handler
+
+        @callback
+        def unregister() -> None:
+            """Stop routing datagrams to the handler."""
+            if self._handlers.get(host) is handler:
+                del self._handlers[host]
+                handler.connection_lost(None)
+
+        return unregister
+
+    @callback
+    def async_add_monitor(self, monitor: asyncio.DatagramProtocol) -> CALLBACK_TYPE:
+        """Pass every datagram to monitor until the callback is called."""
+        self._monitors.append(monitor)
+
+        @callback
+        def remove() -> None:
+            """Stop passing datagrams to the monitor."""
+            self._monitors.remove(monitor)
+
+        return remove
+
+    def request_receive_buffer(self, size: int) -> None:
+        """Grow SO_RCVBUF to at least size bytes.
+
+        The socket is shared, so the largest size requested by any config
+        entry wins.
+        """
+        if size <= self._receive_buffer or self.transport is None:
+            return
+        if (sock := self.transport.get_extra_info("socket")) is None:
+            return
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+        self._receive_buffer = size
+        _LOGGER.debug(
+            "UDP receive buffer set to %s bytes (requested %s)",
+            sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
+            size,
+        )
+
+    def close(self) -> None:
+        """Close the socket."""
+        self._close_reader()
+        self._stop_heartbeat()
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    def _close_reader(self) -> None:
+        """Close the duplicate socket used for draining."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+@dataclass
+class _ListenerState:
+    """The shared listener and the number of coordinators using it."""
+
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    listener: EarnEP1Listener | None = None
+    users: int = 0
+
+
+DATA_LISTENER: HassKey[_ListenerState] = HassKey(f"{DOMAIN}_listener")
+
+
+@callback
+def async_get_listener(hass: HomeAssistant) -> EarnEP1Listener | None:
+    """Return the shared listener if it is running."""
+    if (state := hass.data.get(DATA_LISTENER)) is None:
+        return None
+    return state.listener
+
+
+async def async_acquire_listener(hass: HomeAssistant) -> EarnEP1Listener:
+    """Return the shared listener, opening the socket for the first user.
+
+    Raises:
+        OSError: If the UDP port cannot be opened.
+
+    """
+    state = hass.data.setdefault(DATA_LISTENER, _ListenerState())
+    async with state.lock:
+        if state.listener is not None and state.listener.transport is None:
+            # The socket was lost; its users release it on their own
+            state.listener = None
+            state.users = 0
+        if state.listener is None:
+            listener = EarnEP1Listener()
+            transport, _ = await hass.loop.create_datagram_endpoint(
+                lambda: listener,
+                local_addr=("0.0.0.0", DEFAULT_PORT),
+                allow_broadcast=True,
+            )
+            listener.transport = transport
+            if (sock := transport.get_extra_info("socket")) is not None:
+                listener.socket_inode = os.fstat(sock.fileno()).st_ino
+            listener.async_start_heartbeat(hass.loop)
+            state.listener = listener
+            _LOGGER.debug("UDP listener started on port %s", DEFAULT_PORT)
+        state.users += 1
+        return state.listener
+
+
+@callback
+def async_release_listener(
+    hass: HomeAssistant, listener: EarnEP1Listener | None = None
+) -> None:
+    """Release the shared listener, closing the socket for the last user.
+
+    Releasing a listener that has since been replaced is a no-op.
+    """
+    if (state := hass.data.get(DATA_LISTENER)) is None or not state.users:
+        return
+    if listener is not None and listener is not state.listener:
+        return
+    state.users -= 1
+    if not state.users and state.listener is not None:
+        state.listener.close()
+        state.listener = None
+        _LOGGER.debug("UDP listener stopped")
@@ -0,0 +1,135 @@
+"""Hourly long-term statistics for the EARN-E P1 Meter.
+
+Realtime values are folded into running mean/min/max per hour and meter
+totals into their last reading per hour, then imported as external
+statistics. The recorder only accepts imported statistics for whole
+hours; its 5-minute table is compiled from states and cannot be imported.
+The hour in progress is persisted with the coordinator's other state, so
+a restart continues it, or imports it once the next hour has begun.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from typing import Any
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .const import DOMAIN, REALTIME_FIELDS, SENSOR_FIELDS
+from .schema import is_number
+
+# Meter readings are imported as the sum, so hourly deltas are differences
+# of consecutive rows
+SUM_FIELDS = tuple(
+    field
+    for field in SENSOR_FIELDS
+    if field.state_class is SensorStateClass.TOTAL_INCREASING
+)
+
+
+class HourlyAggregator:
+    """Streams payloads into one statistics row per field and hour."""
+
+    __slots__ = ("_hour", "_means", "_readings")
+
+    def __init__(self) -> None:
+        """Initialize an empty aggregator."""
+        self._hour: float | None = None
+        # JSON key -> [count, total, min, max]
+        self._means: dict[str, list[float]] = {}
+        self._readings: dict[str, float] = {}
+
+    def add(
+        self, timestamp: float, payload: Mapping[str, Any]
+    ) -> dict[str, StatisticData]:
+        """Fold a payload received at timestamp into its hour.
+
+        Returns the rows of the previous hour, keyed by JSON key, when the
+        payload is the first of a new hour, and an empty dict otherwise.
+        """
+        hour = timestamp - timestamp % 3600
+        finished: dict[str, StatisticData] = {}
+        if hour != self._hour:
+            if self._hour is not None:
+                finished = self._rows(self._hour)
+            self._hour = hour
+            self._means = {}
+            self._readings = {}
+
+        for field in REALTIME_FIELDS:
+            if not is_number(value := payload.get(field.json_key)):
+                continue
+            if (acc := self._means.get(field.json_key)) is None:
+                self._means[field.json_key] = [1, value, value, value]
+                continue
+            acc[0] += 1
+            acc[1] += value
+            if value < acc[2]:
+                acc[2] = value
+            elif value > acc[3]:
+                acc[3] = value
+        for field in SUM_FIELDS:
+            if is_number(value := payload.get(field.json_key)):
+                self._readings[field.json_key] = value
+        return finished
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the hour in progress to persist across restarts."""
+        return {"hour": self._hour, "means": self._means, "readings": self._readings}
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Continue the persisted hour in progress."""
+        self._hour = data["hour"]
+        self._means = data["means"]
+        self._readings = data["readings"]
+
+    def _rows(self, hour: float) -> dict[str, StatisticData]:
+        """Return the statistics rows of the given hour."""
+        start = datetime.fromtimestamp(hour, UTC)
+        rows: dict[str, StatisticData] = {
+            key: StatisticData(start=start, mean=total / count, min=low, max=high)
+            for key, (count, total, low, high) in self._means.items()
+        }
+        for key, reading in self._readings.items():
+            rows[key] = StatisticData(start=start, state=reading, sum=reading)
+        return rows
+
+
+def statistic_id(identifier: str, key: str) -> str:
+    """Return the external statistic ID of a sensor field."""
+    return f"{DOMAIN}:{slugify(identifier)}_{key}"
+
+
+@callback
+def async_import_hour(
+    hass: HomeAssistant, identifier: str, title: str, rows: dict[str, StatisticData]
+) -> None:
+    """Import one finished hour of rows as external statistics."""
+    if "recorder" not in hass.config.components:
+        return
+    for field in (*REALTIME_FIELDS, *SUM_FIELDS):
+        if (row := rows.get(field.json_key)) is None:
+            continue
+        summed = field.state_class is SensorStateClass.TOTAL_INCREASING
+        metadata = StatisticMetaData(
+            mean_type=(
+                StatisticMeanType.NONE if summed else StatisticMeanType.ARITHMETIC
+            ),
+            has_sum=summed,
+            name=f"{title} {field.key.replace('_', ' ')}",
+            source=DOMAIN,
+            statistic_id=statistic_id(identifier, field.key),
+            unit_of_measurement=field.native_unit_of_measurement,
+        )
+        async_add_external_statistics(hass, metadata, [row])
@@ -0,0 +1,143 @@
+"""Quarter-hour peak (kwartierpiek) tracking for the EARN-E P1 Meter.
+
+Capacity tariffs bill the highest quarter-hour average of delivered power
+in a month. Realtime power is integrated into clock-aligned quarters with
+the trapezoidal rule, splitting a sample interval at the quarter boundary.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+QUARTER = 900
+
+# Longer gaps between samples are not integrated; the meter was offline
+MAX_GAP = 60
+
+
+def _month(timestamp: float) -> str:
+    """Return the local calendar month of a timestamp."""
+    local = dt_util.as_local(datetime.fromtimestamp(timestamp, UTC))
+    return f"{local.year}-{local.month:02d}"
+
+
+class QuarterHourPeak:
+    """Running quarter-hour average and monthly peak of delivered power."""
+
+    __slots__ = (
+        "_covered",
+        "_energy",
+        "_last",
+        "_peak_month",
+        "_quarter",
+        "peak",
+        "peak_start",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an engine without history."""
+        self._quarter: float | None = None
+        # kWh delivered in the current quarter so far, and the seconds of
+        # the quarter covered by samples
+        self._energy = 0.0
+        self._covered = 0.0
+        self._last: tuple[float, float] | None = None
+        self._peak_month: str | None = None
+        self.peak: float | None = None
+        self.peak_start: float | None = None
+
+    def add(self, timestamp: float, power: float) -> dict[str, float | None]:
+        """Integrate a power sample in kW and return the derived values."""
+        if self._last is not None:
+            last_time, last_power = self._last
+            if 0 < timestamp - last_time <= MAX_GAP:
+                self._integrate(last_time, last_power, timestamp, power)
+        self._enter(timestamp - timestamp % QUARTER)
+        self._last = (timestamp, power)
+        return self.values()
+
+    def _integrate(
+        self, start: float, p_start: float, end: float, p_end: float
+    ) -> None:
+        """Add the energy between two samples, closing quarters on the way."""
+        slope = (p_end - p_start) / (end - start)
+        while start < end:
+            quarter = start - start % QUARTER
+            self._enter(quarter)
+            until = min(end, quarter + QUARTER)
+            p_until = p_end if until == end else p_start + slope * (until - start)
+            self._energy += (p_start + p_until) / 2 * (until - start) / 3600
+            self._covered += until - start
+            start, p_start = until, p_until
+
+    def _enter(self, quarter: float) -> None:
+        """Make quarter the current one, closing the previous quarter."""
+        if quarter == self._quarter:
+            return
+        if self._quarter is not None and self._covered:
+            self._close(self._quarter, self._energy * 3600 / self._covered)
+        if (month := _month(quarter)) != self._peak_month:
+            self._peak_month = month
+            self.peak = self.peak_start = None
+        self._quarter = quarter
+        self._energy = 0.0
+        self._covered = 0.0
+
+    def _close(self, quarter: float, average: float) -> None:
+        """Record a finished quarter's average in its month's peak.
+
+        Gaps in a quarter are left out of its average, which assumes the
+        missing seconds drew the same power as the covered ones.
+        """
+        if _month(quarter) != self._peak_month:
+            return
+        if self.peak is None or average > self.peak:
+            self.peak = average
+            self.peak_start = quarter
+
+    def values(self) -> dict[str, float | None]:
+        """Return the running, projected and peak quarter averages in kW."""
+        if self._quarter is None or self._last is None:
+            return {}
+        last_time, last_power = self._last
+        running = self._energy * 3600 / self._covered if self._covered else last_power
+        # The rest of the quarter at the current power, uncovered seconds at
+        # the running average
+        remaining = self._quarter + QUARTER - last_time
+        uncovered = QUARTER - self._covered - remaining
+        projected = (
+            (self._energy + (last_power * remaining + running * uncovered) / 3600)
+            * 3600
+            / QUARTER
+        )
+        return {
+            "power_quarter_average": round(running, 3),
+            "power_quarter_projected": round(projected, 3),
+            "power_month_peak": None if self.peak is None else round(self.peak, 3),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to persist across restarts."""
+        return {
+            "quarter": self._quarter,
+            "energy": self._energy,
+            "covered": self._covered,
+            "last": None if self._last is None else list(self._last),
+            "peak_month": self._peak_month,
+            "peak": self.peak,
+            "peak_start": self.peak_start,
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Continue from persisted state."""
+        self._quarter = data["quarter"]
+        self._energy = data["energy"]
+        self._covered = data["covered"]
+        if (last := data["last"]) is not None:
+            self._last = (last[0], last[1])
+        self._peak_month = data["peak_month"]
+        self.peak = data["peak"]
+        self.peak_start = data["peak_start"]
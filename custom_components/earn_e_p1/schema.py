@@ -0,0 +1,168 @@
+"""Payload schema and validation for the EARN-E P1 Meter.
+
+Every sensor field is compiled once, at import, into an extractor that
+coerces the raw JSON value to the field's type, applies its scale and
+checks its plausibility bounds. The coordinator validates each payload in
+a single pass over its items, which also rejects meter totals that go
+backwards or jump ahead faster than the meter can count.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from homeassistant.components.sensor import SensorStateClass
+
+from .const import SENSOR_FIELDS, P1SensorFieldDescriptor
+from .stats import IngestStats
+
+# Returns the clean value, or None when the raw value is unusable
+type Extractor = Callable[[Any], float | int | None]
+
+
+def is_number(value: Any) -> bool:
+    """Return True for an int or float that is not a bool."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _compile(field: P1SensorFieldDescriptor) -> Extractor:
+    """Return the extractor of a field."""
+    scale = field.scale
+    low = -math.inf if field.minimum is None else field.minimum
+    high = math.inf if field.maximum is None else field.maximum
+
+    def to_float(value: Any) -> float | None:
+        """Coerce, scale and bound-check a value as a float."""
+        if isinstance(value, bool):
+            return None
+        try:
+            number = float(value) * scale
+        except (TypeError, ValueError):
+            return None
+        # NaN fails both comparisons
+        if not low <= number <= high or math.isinf(number):
+            return None
+        return number
+
+    if field.value_type is float:
+        return to_float
+
+    def to_int(value: Any) -> int | None:
+        """Coerce a value as a whole number."""
+        if (number := to_float(value)) is None or not number.is_integer():
+            return None
+        return int(number)
+
+    return to_int
+
+
+EXTRACTORS: dict[str, Extractor] = {
+    field.json_key: _compile(field) for field in SENSOR_FIELDS
+}
+
+
+MONOTONIC_KEYS = frozenset(
+    field.json_key
+    for field in SENSOR_FIELDS
+    if field.state_class is SensorStateClass.TOTAL_INCREASING
+)
+
+MAX_RATES: dict[str, float] = {
+    field.json_key: field.max_rate
+    for field in SENSOR_FIELDS
+    if field.max_rate is not None
+}
+
+# Consecutive implausible readings of a total, agreeing with each other,
+# after which they are accepted as a meter reset or replacement rather
+# than a glitch
+RESET_CONFIRMATIONS = 3
+
+
+class PayloadValidator:
+    """Coerces payload values and rejects implausible ones.
+
+    Keys without a field (serial, model, ...) pass through unchanged.
+    Totals must not go down, nor rise faster than their field's max_rate
+    since they last changed. Rejections are counted in the ingest
+    statistics.
+    """
+
+    __slots__ = ("_candidates", "_changed", "_stats", "_updated")
+
+    def __init__(self, stats: IngestStats, updated: Mapping[str, float]) -> None:
+        """Initialize a validator counting into stats.
+
+        updated holds the loop time each field was last accepted, which
+        bounds the rise of a total not seen changing since startup.
+        """
+        self._stats = stats
+        self._updated = updated
+        # Loop time each total last changed
+        self._changed: dict[str, float] = {}
+        # Per total: consecutive agreeing rejections, the last one and its time
+        self._candidates: dict[str, tuple[int, float, float]] = {}
+
+    def apply(
+        self, payload: Mapping[str, Any], data: Mapping[str, Any], now: float
+    ) -> dict[str, Any]:
+        """Return the clean values of payload given the current data."""
+        result: dict[str, Any] = {}
+        for key, value in payload.items():
+            if (extract := EXTRACTORS.get(key)) is None:
+                result[key] = value
+            elif (clean := extract(value)) is None:
+                self._stats.invalid_values += 1
+            elif key not in MONOTONIC_KEYS or self._plausible(
+                key, clean, data.get(key), now
+            ):
+                result[key] = clean
+        return result
+
+    def _plausible(self, key: str, value: float, previous: Any, now: float) -> bool:
+        """Return True if value may follow the previous reading of a total.
+
+        An implausible reading is rejected as a glitch until it persists:
+        RESET_CONFIRMATIONS of them in a row, each a plausible successor of
+        the one before, are accepted. A zero never confirms a reset, as a
+        field dropped by the meter reads as zero.
+        """
+        if previous is None:
+            self._changed[key] = now
+        if previous is None or value == previous:
+            self._candidates.pop(key, None)
+            return True
+        since = self._changed.get(key, self._updated.get(key, now))
+        if self._rising(key, previous, value, now - since):
+            self._candidates.pop(key, None)
+            self._changed[key] = now
+            return True
+
+        count, last, last_time = self._candidates.pop(key, (0, value, now))
+        if not value:
+            count = 0
+        elif count and self._rising(key, last, value, now - last_time):
+            count += 1
+        else:
+            count = 1
+        if count >= RESET_CONFIRMATIONS:
+            self._changed[key] = now
+            return True
+        if count:
+            self._candidates[key] = (count, value, now)
+        if value < previous:
+            self._stats.decreasing_totals += 1
+        else:
+            self._stats.jumping_totals += 1
+        return False
+
+    @staticmethod
+    def _rising(key: str, previous: float, value: float, elapsed: float) -> bool:
+        """Return True if a total may go from previous to value in elapsed s."""
+        if value < previous:
+            return False
+        if (rate := MAX_RATES.get(key)) is None:
+            return True
+        return value - previous <= rate * elapsed / 3600
@@ -2,16 +2,34 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import partial
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 
 from . import EarnEP1ConfigEntry
-from .const import SENSOR_FIELDS, P1SensorFieldDescriptor
+from .const import (
+    DERIVED_FIELDS,
+    DIAGNOSTICS_CONTEXT,
+    SENSOR_FIELDS,
+    P1DerivedFieldDescriptor,
+    P1SensorFieldDescriptor,
+)
 from .coordinator import EarnEP1Coordinator
 from .entity import EarnEP1Entity
+from .listener import EarnEP1Listener, async_get_listener
+from .stats import IngestStats
 
 SENSOR_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = tuple(
     SensorEntityDescription(
@@ -24,8 +42,104 @@ SENSOR_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = tuple(
     for field in SENSOR_FIELDS
 )
 
+# Derived sensors are disabled by default. Enable the averages and exclude
+# the 1 Hz sensors from the recorder to store one state per window instead
+DERIVED_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = tuple(
+    SensorEntityDescription(
+        key=field.key,
+        translation_key=field.key,
+        native_unit_of_measurement=field.native_unit_of_measurement,
+        device_class=field.device_class,
+        state_class=field.state_class,
+        entity_registry_enabled_default=False,
+    )
+    for field in DERIVED_FIELDS
+)
+
 # Build a lookup from key to field descriptor for availability checks
 _FIELD_BY_KEY: dict[str, P1SensorFieldDescriptor] = {f.key: f for f in SENSOR_FIELDS}
+_DERIVED_BY_KEY: dict[str, P1DerivedFieldDescriptor] = {
+    f.key: f for f in DERIVED_FIELDS
+}
+
+
+def _milliseconds(value: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if value is None else round(value * 1000, 3)
+
+
+@dataclass(frozen=True, kw_only=True)
+class EarnEP1DiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes an ingest diagnostic sensor.
+
+    Values of the shared listener are read with listener_value_fn instead.
+    """
+
+    value_fn: Callable[[IngestStats], StateType] | None = None
+    listener_value_fn: Callable[[EarnEP1Listener], StateType] | None = None
+    entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+
+
+def _counter(
+    key: str, value_fn: Callable[[IngestStats], int | None]
+) -> EarnEP1DiagnosticSensorEntityDescription:
+    """Describe a packet counter sensor."""
+    return EarnEP1DiagnosticSensorEntityDescription(
+        key=key,
+        translation_key=key,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=value_fn,
+    )
+
+
+DIAGNOSTIC_DESCRIPTIONS: tuple[EarnEP1DiagnosticSensorEntityDescription, ...] = (
+    _counter("packets_received", lambda stats: stats.received),
+    _counter("packets_accepted", lambda stats: stats.accepted),
+    _counter("decode_errors", lambda stats: stats.decode_errors),
+    _counter("invalid_payloads", lambda stats: stats.non_dict),
+    _counter("duplicate_packets", lambda stats: stats.duplicates),
+    _counter("invalid_values", lambda stats: stats.invalid_values),
+    _counter("decreasing_totals", lambda stats: stats.decreasing_totals),
+    _counter("jumping_totals", lambda stats: stats.jumping_totals),
+    _counter("kernel_drops", lambda stats: stats.kernel_drops),
+    _counter("superseded_samples", lambda stats: stats.superseded),
+    EarnEP1DiagnosticSensorEntityDescription(
+        key="packet_interval",
+        translation_key="packet_interval",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda stats: stats.inter_arrival.mean,
+    ),
+    EarnEP1DiagnosticSensorEntityDescription(
+        key="handler_latency_p95",
+        translation_key="handler_latency_p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: _milliseconds(stats.handler_latency.quantile(0.95)),
+    ),
+    EarnEP1DiagnosticSensorEntityDescription(
+        key="publish_latency_p95",
+        translation_key="publish_latency_p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: _milliseconds(stats.publish_latency.quantile(0.95)),
+    ),
+    EarnEP1DiagnosticSensorEntityDescription(
+        key="loop_lag_p95",
+        translation_key="loop_lag_p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        listener_value_fn=lambda listener: _milliseconds(
+            listener.loop_lag.quantile(0.95)
+        ),
+    ),
+)
 
 
 async def async_setup_entry(
@@ -33,11 +147,37 @@ async def async_setup_entry(
     entry: EarnEP1ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up EARN-E P1 sensor entities."""
+    """Set up EARN-E P1 sensor entities.
+
+    Field sensors are created the first time their key appears in the data,
+    so fields the meter never sends cost no entity or listener.
+    """
     coordinator = entry.runtime_data
+    pending: dict[str, Callable[[], SensorEntity]] = {}
+    for description in SENSOR_DESCRIPTIONS:
+        pending[_FIELD_BY_KEY[description.key].json_key] = partial(
+            EarnEP1Sensor, coordinator, description
+        )
+    for description in DERIVED_DESCRIPTIONS:
+        pending[description.key] = partial(
+            EarnEP1DerivedSensor, coordinator, description
+        )
+
+    @callback
+    def _async_add_fields(keys: Iterable[str]) -> None:
+        """Add the sensors of newly discovered keys."""
+        entities = [pending.pop(key)() for key in keys if key in pending]
+        if entities:
+            async_add_entities(entities)
+
+    entry.async_on_unload(coordinator.async_add_discovery_listener(_async_add_fields))
     async_add_entities(
-        EarnEP1Sensor(coordinator, description) for description in SENSOR_DESCRIPTIONS
+        [
+            EarnEP1DiagnosticSensor(coordinator, description)
+            for description in DIAGNOSTIC_DESCRIPTIONS
+        ]
     )
+    _async_add_fields(coordinator.discovered)
 
 
 class EarnEP1Sensor(EarnEP1Entity, SensorEntity):
@@ -49,9 +189,10 @@ class EarnEP1Sensor(EarnEP1Entity, SensorEntity):
         description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.entity_description = description
         self._field = _FIELD_BY_KEY[description.key]
+        # Subscribe by JSON key so unchanged fields skip the state write
+        super().__init__(coordinator, context=self._field.json_key)
+        self.entity_description = description
         self._attr_unique_id = f"{coordinator.identifier}_{description.key}"
 
     @property
@@ -61,7 +202,8 @@ class EarnEP1Sensor(EarnEP1Entity, SensorEntity):
             return False
         if not self.coordinator.data:
             return False
-        return self._field.json_key in self.coordinator.data
+        key = self._field.json_key
+        return key in self.coordinator.data and key not in self.coordinator.expired
 
     @property
     def native_value(self) -> Any:
@@ -69,3 +211,66 @@ class EarnEP1Sensor(EarnEP1Entity, SensorEntity):
         if not self.coordinator.data:
             return None
         return self.coordinator.data.get(self._field.json_key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag a value restored at startup until a packet confirms it."""
+        if self._field.json_key in self.coordinator.restored:
+            return {"stale": True}
+        return None
+
+
+class EarnEP1DerivedSensor(EarnEP1Entity, SensorEntity):
+    """Representation of a value derived from an EARN-E P1 sensor."""
+
+    def __init__(
+        self,
+        coordinator: EarnEP1Coordinator,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the derived sensor."""
+        self._field = _DERIVED_BY_KEY[description.key]
+        super().__init__(coordinator, context=self._field.key)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.identifier}_{description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Return True once a value was derived and while the source is fresh."""
+        return (
+            super().available
+            and self._field.key in self.coordinator.data
+            and self._field.source.json_key not in self.coordinator.expired
+        )
+
+    @property
+    def native_value(self) -> Any:
+        """Return the derived value."""
+        return self.coordinator.data.get(self._field.key)
+
+
+class EarnEP1DiagnosticSensor(EarnEP1Entity, SensorEntity):
+    """Representation of an EARN-E P1 ingest diagnostic sensor."""
+
+    entity_description: EarnEP1DiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: EarnEP1Coordinator,
+        description: EarnEP1DiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the diagnostic sensor."""
+        super().__init__(coordinator, context=DIAGNOSTICS_CONTEXT)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.identifier}_{description.key}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the diagnostic value."""
+        description = self.entity_description
+        if description.listener_value_fn is not None:
+            if (listener := async_get_listener(self.hass)) is None:
+                return None
+            return description.listener_value_fn(listener)
+        assert description.value_fn is not None
+        return description.value_fn(self.coordinator.stats)
@@ -0,0 +1,96 @@
+"""Services for the EARN-E P1 Meter integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import EarnEP1Coordinator
+
+SERVICE_GET_SAMPLES = "get_samples"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_BUCKET = "bucket"
+
+GET_SAMPLES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_BUCKET): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    """Convert an optional datetime to a POSIX timestamp.
+
+    Naive datetimes, as entered in the UI, are in Home Assistant's time zone.
+    """
+    return None if value is None else dt_util.as_utc(value).timestamp()
+
+
+@callback
+def _async_get_coordinator(hass: HomeAssistant, entry_id: str) -> EarnEP1Coordinator:
+    """Return the coordinator of a loaded config entry.
+
+    Raises:
+        ServiceValidationError: If the entry is unknown or not loaded.
+
+    """
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_found",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"title": entry.title},
+        )
+    return entry.runtime_data
+
+
+async def _async_get_samples(call: ServiceCall) -> ServiceResponse:
+    """Return buffered realtime samples, optionally downsampled."""
+    coordinator = _async_get_coordinator(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    if coordinator.samples is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="history_disabled",
+        )
+    return coordinator.samples.query(
+        _timestamp(call.data.get(ATTR_START)),
+        _timestamp(call.data.get(ATTR_END)),
+        call.data.get(ATTR_BUCKET),
+    )
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SAMPLES,
+        _async_get_samples,
+        schema=GET_SAMPLES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
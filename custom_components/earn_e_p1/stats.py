@@ -0,0 +1,147 @@
+"""Ingest instrumentation for the EARN-E P1 Meter."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+PROC_NET_UDP: tuple[str, ...] = ("/proc/net/udp", "/proc/net/udp6")
+
+# Upper bucket bounds in seconds; the last bucket is open-ended
+INTER_ARRIVAL_BUCKETS: tuple[float, ...] = (
+    0.01, 0.1, 0.5, 0.9, 1.1, 1.5, 2.0, 5.0, 10.0, 30.0, 61.0, 300.0,
+)  # fmt: skip
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1,
+)  # fmt: skip
+LOOP_LAG_BUCKETS: tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)  # fmt: skip
+
+
+class Histogram:
+    """Fixed-bucket histogram using constant memory."""
+
+    __slots__ = ("bounds", "count", "counts", "maximum", "total")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialize an empty histogram with the given upper bucket bounds."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the recorded values."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bound of the bucket holding the q-th quantile.
+
+        Values in the open-ended last bucket report the maximum seen.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.maximum
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as a JSON-serializable dict."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.maximum,
+            "buckets": {
+                **{
+                    f"le_{bound:g}": count
+                    for bound, count in zip(self.bounds, self.counts, strict=False)
+                },
+                "inf": self.counts[-1],
+            },
+        }
+
+
+@dataclass(slots=True)
+class IngestStats:
+    """Counters and timing histograms for the UDP ingest path."""
+
+    received: int = 0
+    accepted: int = 0
+    decode_errors: int = 0
+    non_dict: int = 0
+    duplicates: int = 0
+    # Field values that failed coercion or bounds, and totals that went down
+    # or rose implausibly fast
+    invalid_values: int = 0
+    decreasing_totals: int = 0
+    jumping_totals: int = 0
+    inter_arrival: Histogram = field(
+        default_factory=lambda: Histogram(INTER_ARRIVAL_BUCKETS)
+    )
+    handler_latency: Histogram = field(
+        default_factory=lambda: Histogram(LATENCY_BUCKETS)
+    )
+    publish_latency: Histogram = field(
+        default_factory=lambda: Histogram(LATENCY_BUCKETS)
+    )
+    # Buffered payloads replaced by newer ones while the loop was stalled
+    superseded: int = 0
+    # Datagrams the kernel dropped for our socket, None where unavailable
+    kernel_drops: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a JSON-serializable dict."""
+        return {
+            "received": self.received,
+            "accepted": self.accepted,
+            "decode_errors": self.decode_errors,
+            "non_dict": self.non_dict,
+            "duplicates": self.duplicates,
+            "invalid_values": self.invalid_values,
+            "decreasing_totals": self.decreasing_totals,
+            "jumping_totals": self.jumping_totals,
+            "inter_arrival": self.inter_arrival.as_dict(),
+            "handler_latency": self.handler_latency.as_dict(),
+            "publish_latency": self.publish_latency.as_dict(),
+            "superseded": self.superseded,
+            "kernel_drops": self.kernel_drops,
+        }
+
+
+def read_udp_drops(inode: int, paths: Iterable[str] = PROC_NET_UDP) -> int | None:
+    """Return the kernel drop counter of the UDP socket with the given inode.
+
+    Reads the ``drops`` column of ``/proc/net/udp`` and ``/proc/net/udp6``.
+    Returns None if the socket is not listed or the files do not exist
+    (for example on non-Linux hosts). Does blocking I/O.
+    """
+    wanted = str(inode)
+    for path in paths:
+        try:
+            with open(path, encoding="ascii") as file:
+                next(file, None)
+                for line in file:
+                    columns = line.split()
+                    # inode is the 10th column, drops the last
+                    if len(columns) > 12 and columns[9] == wanted:
+                        return int(columns[-1])
+        except OSError:
+            continue
+    return None
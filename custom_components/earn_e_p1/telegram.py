@@ -0,0 +1,116 @@
+"""In-place telegram state for the EARN-E P1 Meter."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+_MISSING: Any = object()
+
+
+class TelegramState(Mapping[str, Any]):
+    """Merged telegram values, updated in place on every packet.
+
+    Known JSON keys live in a fixed-size list indexed by field order, so a
+    packet updates slots instead of copying a dict. Unknown keys (serial,
+    model, ...) are kept in a small side dict. The state behaves as a
+    read-only mapping and bumps ``version`` whenever a value changes.
+    """
+
+    __slots__ = (
+        "_extra",
+        "_index",
+        "_keys",
+        "_size",
+        "_snapshot",
+        "_values",
+        "version",
+    )
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        """Initialize an empty state for the given JSON keys."""
+        self._keys: tuple[str, ...] = tuple(keys)
+        self._index: dict[str, int] = {key: i for i, key in enumerate(self._keys)}
+        self._values: list[Any] = [_MISSING] * len(self._keys)
+        self._extra: dict[str, Any] = {}
+        self._size = 0
+        self._snapshot: dict[str, Any] | None = None
+        self.version = 0
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value for a JSON key."""
+        index = self._index.get(key)
+        if index is None:
+            return self._extra[key]
+        value = self._values[index]
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value for a JSON key, or the default."""
+        index = self._index.get(key)
+        if index is None:
+            return self._extra.get(key, default)
+        value = self._values[index]
+        return default if value is _MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if a value was received for the key."""
+        index = self._index.get(key)  # type: ignore[call-overload]
+        if index is None:
+            return key in self._extra
+        return self._values[index] is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys that hold a value."""
+        for key, value in zip(self._keys, self._values, strict=True):
+            if value is not _MISSING:
+                yield key
+        yield from self._extra
+
+    def __len__(self) -> int:
+        """Return the number of keys that hold a value."""
+        return self._size + len(self._extra)
+
+    def update(self, payload: Mapping[str, Any]) -> list[str]:
+        """Merge a payload in place and return the keys whose value changed."""
+        changed: list[str] = []
+        values = self._values
+        for key, value in payload.items():
+            index = self._index.get(key)
+            if index is None:
+                if key not in self._extra or self._extra[key] != value:
+                    self._extra[key] = value
+                    changed.append(key)
+                continue
+            previous = values[index]
+            if previous is _MISSING:
+                self._size += 1
+            elif previous == value:
+                continue
+            values[index] = value
+            changed.append(key)
+
+        if changed:
+            self.version += 1
+            self._snapshot = None
+        return changed
+
+    def replace(self, payload: Mapping[str, Any]) -> None:
+        """Replace all values with the given payload."""
+        self._values[:] = [_MISSING] * len(self._keys)
+        self._extra.clear()
+        self._size = 0
+        self.update(payload)
+        self.version += 1
+        self._snapshot = None
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a plain dict of the current values.
+
+        The dict is built at most once per version and must not be mutated.
+        """
+        if self._snapshot is None:
+            self._snapshot = dict(self.items())
+        return self._snapshot
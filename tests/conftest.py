@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
-from unittest.mock import patch
+from collections.abc import Awaitable, Callable
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.earn_e_p1.const import DOMAIN
+from custom_components.earn_e_p1.coordinator import EarnEP1Coordinator
 
 MOCK_HOST = "192.168.1.100"
 MOCK_SERIAL = "E0012345678901234"
@@ -32,6 +35,25 @@ def mock_config_entry(hass):
     return entry
 
 
+@pytest.fixture
+def setup_integration(
+    hass: HomeAssistant,
+) -> Callable[[MockConfigEntry], Awaitable[EarnEP1Coordinator]]:
+    """Return a function that sets up an entry without opening the socket."""
+
+    async def _setup(entry: MockConfigEntry) -> EarnEP1Coordinator:
+        """Set up the integration and return the coordinator."""
+        with patch(
+            "custom_components.earn_e_p1.coordinator.EarnEP1Coordinator.async_start",
+            new_callable=AsyncMock,
+        ):
+            await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+        return entry.runtime_data
+
+    return _setup
+
+
 @pytest.fixture
 def mock_setup_entry():
     """Patch async_setup_entry to avoid real UDP sockets in config flow tests."""
@@ -0,0 +1,44 @@
+"""Tests for the EARN-E P1 Meter tumbling averages."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.earn_e_p1.averages import TumblingAverage
+
+
+def test_tumbling_average_reports_each_window_once() -> None:
+    """Test that a window's mean is returned by the next window's first sample."""
+    average = TumblingAverage(60)
+
+    assert average.add(120.0, 1.0) is None
+    assert average.add(150.0, 2.0) is None
+    assert average.add(179.9, 3.0) is None
+    assert average.add(180.0, 10.0) == 2.0
+    assert average.add(181.0, 20.0) is None
+    # Skipped windows are not reported
+    assert average.add(600.0, 0.0) == 15.0
+
+
+async def test_coordinator_publishes_averages(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that average keys change only when a window ends."""
+    coordinator = await setup_integration(mock_config_entry)
+    average_updates = MagicMock()
+    coordinator.async_add_listener(average_updates, "power_delivered_average_1m")
+
+    for second, power in ((900, 1.0), (930, 2.0), (960, 4.0)):
+        with patch(
+            "custom_components.earn_e_p1.coordinator.time.time", return_value=second
+        ):
+            coordinator.async_set_updated_fields(
+                {"power_delivered": power, "power_returned": 0.0}
+            )
+
+    average_updates.assert_called_once()
+    assert coordinator.data["power_delivered_average_1m"] == 1.5
+    assert coordinator.data["power_returned_average_1m"] == 0.0
+    assert "power_delivered_average_15m" not in coordinator.data
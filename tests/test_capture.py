@@ -0,0 +1,140 @@
+"""Tests for EARN-E P1 Meter datagram capture and replay."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.earn_e_p1.capture import (
+    CAPTURE_GLOB,
+    CapturedPacket,
+    PacketRecorder,
+    async_replay,
+    read_capture,
+)
+from custom_components.earn_e_p1.const import CAPTURE_DIRECTORY, CONF_CAPTURE, DOMAIN
+from custom_components.earn_e_p1.coordinator import EarnEP1UDPProtocol
+
+from .conftest import MOCK_HOST, MOCK_SERIAL
+
+
+def test_recorder_round_trip(tmp_path: Path) -> None:
+    """Test that recorded datagrams are read back byte for byte."""
+    recorder = PacketRecorder(tmp_path)
+    recorder.start()
+    recorder.record(b'{"power_delivered":1.0}', (MOCK_HOST, 16121), 100.0)
+    recorder.record(b"\xff{broken", ("192.168.1.5", 5000), 101.5)
+    recorder.stop()
+
+    packets = list(read_capture(sorted(tmp_path.glob(CAPTURE_GLOB))))
+
+    assert packets == [
+        CapturedPacket(100.0, (MOCK_HOST, 16121), b'{"power_delivered":1.0}'),
+        CapturedPacket(101.5, ("192.168.1.5", 5000), b"\xff{broken"),
+    ]
+
+
+def test_recorder_rotates_and_prunes(tmp_path: Path) -> None:
+    """Test that full files are rotated and old ones removed."""
+    recorder = PacketRecorder(tmp_path, max_bytes=1, backup_count=2)
+    recorder.start()
+    for i in range(5):
+        recorder.record(b"{}", (MOCK_HOST, 16121), float(i))
+    recorder.stop()
+
+    files = sorted(tmp_path.glob(CAPTURE_GLOB))
+    assert len(files) == 2
+    assert [packet.received for packet in read_capture(files)] == [3.0, 4.0]
+
+
+def test_unclosed_capture_is_readable(tmp_path: Path) -> None:
+    """Test that a capture cut short by a crash reads up to its last flush."""
+    recorder = PacketRecorder(tmp_path, flush_interval=0.01)
+    recorder.start()
+    for i in range(3):
+        recorder.record(b"{}", (MOCK_HOST, 16121), float(i))
+    try:
+        for _ in range(200):
+            time.sleep(0.01)
+            files = list(tmp_path.glob(CAPTURE_GLOB))
+            if files and files[0].stat().st_size > 20:
+                break
+        # Copy the file as a crash would leave it, without the gzip trailer
+        data = files[0].read_bytes()
+    finally:
+        recorder.stop()
+    crashed = tmp_path / "crashed.jsonl.gz"
+    crashed.write_bytes(data)
+
+    assert [packet.received for packet in read_capture([crashed])] == [0.0, 1.0, 2.0]
+
+    # A tail cut inside a line is skipped
+    crashed.write_bytes(data[:-12])
+    assert len(list(read_capture([crashed]))) < 3
+
+
+def test_recorder_drops_when_full(tmp_path: Path) -> None:
+    """Test that a full queue drops and counts datagrams."""
+    recorder = PacketRecorder(tmp_path, max_queue=2)
+    for i in range(5):
+        recorder.record(b"{}", (MOCK_HOST, 16121), float(i))
+    assert recorder.dropped == 3
+
+    recorder.start()
+    recorder.stop()
+    files = sorted(tmp_path.glob(CAPTURE_GLOB))
+    assert [packet.received for packet in read_capture(files)] == [0.0, 1.0]
+
+
+def test_recorder_stops_after_write_error(tmp_path: Path) -> None:
+    """Test that recording stops once the writer thread died."""
+    recorder = PacketRecorder(tmp_path, max_queue=2)
+    recorder.start()
+    with patch.object(recorder, "_open", side_effect=OSError):
+        recorder.record(b"{}", (MOCK_HOST, 16121), 0.0)
+        recorder._thread.join(5)
+    assert recorder.failed
+
+    for i in range(5):
+        recorder.record(b"{}", (MOCK_HOST, 16121), float(i))
+    assert recorder.dropped == 0
+    recorder.stop()
+
+
+async def test_capture_option_records_and_replays(
+    hass: HomeAssistant, tmp_path: Path, setup_integration
+) -> None:
+    """Test capturing through the coordinator and replaying the capture."""
+    hass.config.config_dir = str(tmp_path)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: MOCK_HOST, "serial": MOCK_SERIAL},
+        options={CONF_CAPTURE: True},
+        unique_id=MOCK_SERIAL,
+    )
+    entry.add_to_hass(hass)
+    coordinator = await setup_integration(entry)
+    recorder = coordinator.packet_recorder
+    assert recorder is not None
+    assert recorder.directory == tmp_path / CAPTURE_DIRECTORY / MOCK_SERIAL
+
+    await hass.async_add_executor_job(recorder.start)
+    protocol = EarnEP1UDPProtocol(coordinator)
+    protocol.datagram_received(b'{"power_delivered": 1.5}', (MOCK_HOST, 16121))
+    protocol.datagram_received(b'{"power_delivered": 2.5}', (MOCK_HOST, 16121))
+    await coordinator.async_stop()
+
+    files = sorted(recorder.directory.glob(CAPTURE_GLOB))
+    packets = await hass.async_add_executor_job(lambda: list(read_capture(files)))
+    coordinator.async_set_updated_data({})
+
+    # A fresh protocol, so the replay is not suppressed as duplicates
+    protocol = EarnEP1UDPProtocol(coordinator)
+    assert await async_replay(packets, protocol, speed=0) == 2
+    await hass.async_block_till_done()
+    assert coordinator.data["power_delivered"] == 2.5
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from unittest.mock import patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST
@@ -11,13 +13,21 @@ from homeassistant.data_entry_flow import FlowResultType
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.earn_e_p1.config_flow import DeviceInfo
-from custom_components.earn_e_p1.const import DOMAIN
+from custom_components.earn_e_p1.const import (
+    CONF_DEADBAND_MODE,
+    CONF_MAX_SILENCE,
+    DEADBAND_MODE_RELATIVE,
+    DOMAIN,
+)
+from custom_components.earn_e_p1.listener import (
+    async_acquire_listener,
+    async_release_listener,
+)
 
 from .conftest import MOCK_HOST, MOCK_SERIAL
 
 LISTEN_PATH = (
-    "custom_components.earn_e_p1.config_flow.EarnEP1ConfigFlow"
-    "._async_listen_for_device"
+    "custom_components.earn_e_p1.config_flow.EarnEP1ConfigFlow._async_listen_for_device"
 )
 
 
@@ -25,7 +35,9 @@ async def test_user_flow_discovery_succeeds(
     hass: HomeAssistant, mock_setup_entry
 ) -> None:
     """Test user flow when auto-discovery finds a device."""
-    with patch(LISTEN_PATH, return_value=DeviceInfo(host=MOCK_HOST, serial=MOCK_SERIAL)):
+    with patch(
+        LISTEN_PATH, return_value=DeviceInfo(host=MOCK_HOST, serial=MOCK_SERIAL)
+    ):
         result = await hass.config_entries.flow.async_init(
             DOMAIN, context={"source": config_entries.SOURCE_USER}
         )
@@ -179,24 +191,144 @@ async def test_manual_entry_no_serial_uses_host_as_unique_id(
     assert result["result"].unique_id == MOCK_HOST
 
 
-async def test_single_config_entry_abort(
+async def test_second_meter_can_be_added(hass: HomeAssistant, mock_setup_entry) -> None:
+    """Test that a second meter with another serial gets its own entry."""
+    existing = MockConfigEntry(
+        domain=DOMAIN,
+        title="Existing",
+        data={CONF_HOST: "192.168.1.50", "serial": "E0099999999999999"},
+        unique_id="E0099999999999999",
+    )
+    existing.add_to_hass(hass)
+
+    with patch(
+        LISTEN_PATH, return_value=DeviceInfo(host=MOCK_HOST, serial=MOCK_SERIAL)
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={}
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id == MOCK_SERIAL
+    assert len(hass.config_entries.async_entries(DOMAIN)) == 2
+
+
+async def test_discovery_uses_running_listener(
+    hass: HomeAssistant, mock_setup_entry
+) -> None:
+    """Test that discovery watches the shared listener instead of the port."""
+    transport = MagicMock()
+    transport.get_extra_info.return_value = None
+    with patch.object(
+        hass.loop,
+        "create_datagram_endpoint",
+        AsyncMock(return_value=(transport, None)),
+    ) as mock_endpoint:
+        listener = await async_acquire_listener(hass)
+        mock_endpoint.reset_mock()
+
+        flow = hass.async_create_task(
+            hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": config_entries.SOURCE_USER}
+            )
+        )
+        while not listener._monitors:
+            await asyncio.sleep(0)
+        listener.datagram_received(
+            json.dumps({"serial": MOCK_SERIAL, "power_delivered": 1.0}).encode(),
+            (MOCK_HOST, 16121),
+        )
+        result = await flow
+
+    mock_endpoint.assert_not_called()
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "discovery_confirm"
+    assert result["description_placeholders"] == {"host": MOCK_HOST}
+    async_release_listener(hass)
+
+
+async def test_flow_answers_from_recent_devices(
     hass: HomeAssistant, mock_setup_entry
 ) -> None:
-    """Test that a second config entry is blocked (single_config_entry)."""
+    """Test that discovery and validation use devices the listener has seen."""
     existing = MockConfigEntry(
         domain=DOMAIN,
-        title="Existing",
-        data={CONF_HOST: "192.168.1.50", "serial": MOCK_SERIAL},
-        unique_id=MOCK_SERIAL,
+        data={CONF_HOST: "192.168.1.50", "serial": "E0099999999999999"},
+        unique_id="E0099999999999999",
     )
     existing.add_to_hass(hass)
+    transport = MagicMock()
+    transport.get_extra_info.return_value = None
+    with patch.object(
+        hass.loop,
+        "create_datagram_endpoint",
+        AsyncMock(return_value=(transport, None)),
+    ):
+        listener = await async_acquire_listener(hass)
+    listener.datagram_received(
+        json.dumps({"serial": MOCK_SERIAL, "power_delivered": 1.0}).encode(),
+        (MOCK_HOST, 16121),
+    )
+    listener.datagram_received(
+        json.dumps({"serial": "E0099999999999999"}).encode(),
+        ("192.168.1.50", 16121),
+    )
 
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
+    assert result["step_id"] == "discovery_confirm"
+    assert result["description_placeholders"] == {"host": MOCK_HOST}
 
-    assert result["type"] is FlowResultType.ABORT
-    assert result["reason"] == "single_instance_allowed"
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_HOST: MOCK_HOST}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_HOST: MOCK_HOST, "serial": MOCK_SERIAL}
+    assert not listener._monitors
+    async_release_listener(hass)
+
+
+async def test_discovery_monitor_skips_loaded_meter(
+    hass: HomeAssistant, mock_config_entry
+) -> None:
+    """Test that discovery ignores the traffic of a meter already loaded."""
+    transport = MagicMock()
+    transport.get_extra_info.return_value = None
+    with patch.object(
+        hass.loop,
+        "create_datagram_endpoint",
+        AsyncMock(return_value=(transport, None)),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    listener = mock_config_entry.runtime_data._listener
+
+    flow = hass.async_create_task(
+        hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+    )
+    while not listener._monitors:
+        await asyncio.sleep(0)
+    # Realtime packets of the loaded meter carry no serial
+    listener.datagram_received(
+        json.dumps({"power_delivered": 1.0}).encode(), (MOCK_HOST, 16121)
+    )
+    await asyncio.sleep(0)
+    assert not flow.done()
+    listener.datagram_received(
+        json.dumps({"power_delivered": 2.0}).encode(), ("192.168.1.101", 16121)
+    )
+    result = await flow
+
+    assert result["step_id"] == "discovery_confirm"
+    assert result["description_placeholders"] == {"host": "192.168.1.101"}
+    hass.config_entries.flow.async_abort(result["flow_id"])
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
 
 
 async def test_reconfigure_succeeds(
@@ -308,3 +440,30 @@ async def test_discovery_no_serial_uses_host(
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
     assert result["result"].unique_id == MOCK_HOST
+
+
+async def test_options_flow(
+    hass: HomeAssistant, mock_config_entry, mock_setup_entry
+) -> None:
+    """Test the options flow stores publish filter settings."""
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_DEADBAND_MODE: DEADBAND_MODE_RELATIVE,
+            CONF_MAX_SILENCE: 120,
+            "voltage_l1_deadband": 0.5,
+            "voltage_l1_precision": 1,
+        },
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options[CONF_DEADBAND_MODE] == DEADBAND_MODE_RELATIVE
+    assert mock_config_entry.options[CONF_MAX_SILENCE] == 120
+    assert mock_config_entry.options["voltage_l1_deadband"] == 0.5
+    assert mock_config_entry.options["voltage_l1_precision"] == 1
+    assert mock_config_entry.options["power_delivered_deadband"] == 0.0
+    assert "power_delivered_precision" not in mock_config_entry.options
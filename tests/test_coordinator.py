@@ -0,0 +1,471 @@
+"""Tests for the EARN-E P1 Meter coordinator and UDP protocol."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.earn_e_p1.const import (
+    CONF_DEADBAND_MODE,
+    CONF_MAX_SILENCE,
+    CONF_RECEIVE_BUFFER,
+    DEADBAND_MODE_RELATIVE,
+    DOMAIN,
+)
+from custom_components.earn_e_p1.coordinator import (
+    EarnEP1Coordinator,
+    EarnEP1UDPProtocol,
+)
+from custom_components.earn_e_p1.deadband import DeadbandFilter, FieldDeadband
+from custom_components.earn_e_p1.listener import EarnEP1Listener, async_get_listener
+
+from .conftest import MOCK_HOST, MOCK_SERIAL
+
+
+def _send(
+    protocol: asyncio.DatagramProtocol, payload: dict, host: str = MOCK_HOST
+) -> None:
+    """Feed a JSON payload into the protocol as a datagram."""
+    protocol.datagram_received(json.dumps(payload).encode(), (host, 16121))
+
+
+async def test_datagram_merges_into_data(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that successive datagrams are merged into coordinator data."""
+    coordinator = await setup_integration(mock_config_entry)
+    protocol = EarnEP1UDPProtocol(coordinator)
+
+    _send(protocol, {"power_delivered": 1.0, "voltage_l1": 230.0})
+    _send(protocol, {"energy_delivered_tariff1": 100.0})
+    await hass.async_block_till_done()
+
+    assert coordinator.data["power_delivered"] == 1.0
+    assert coordinator.data["energy_delivered_tariff1"] == 100.0
+    assert hass.states.get("sensor.earn_e_p1_meter_power_delivered").state == "1.0"
+
+
+async def test_datagram_values_are_extracted(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that datagram values pass through the payload schema."""
+    coordinator = await setup_integration(mock_config_entry)
+    protocol = EarnEP1UDPProtocol(coordinator)
+
+    _send(protocol, {"voltage_l2": "231.5", "current_l3": -4.0, "model": "P1"})
+    await hass.async_block_till_done()
+
+    assert coordinator.data["voltage_l2"] == 231.5
+    assert "current_l3" not in coordinator.data
+    assert coordinator.model == "P1"
+
+
+async def test_decreasing_total_is_not_published(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that a glitched meter total never reaches the data."""
+    coordinator = await setup_integration(mock_config_entry)
+    coordinator.async_set_updated_fields({"gas_delivered": 1234.5})
+    coordinator.async_set_updated_fields({"gas_delivered": 0.0})
+
+    assert coordinator.data["gas_delivered"] == 1234.5
+    assert coordinator.stats.decreasing_totals == 1
+
+
+async def test_only_changed_fields_notify_listeners(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that listeners are only called for keys whose value changed."""
+    coordinator = await setup_integration(mock_config_entry)
+    protocol = EarnEP1UDPProtocol(coordinator)
+
+    calls: dict[str, int] = {"power_delivered": 0, "voltage_l1": 0}
+    for key in calls:
+        coordinator.async_add_listener(
+            lambda key=key: calls.__setitem__(key, calls[key] + 1), key
+        )
+
+    for power in (1.0, 1.5, 1.5):
+        _send(protocol, {"power_delivered": power, "voltage_l1": 230.0})
+        await hass.async_block_till_done()
+
+    assert calls == {"power_delivered": 2, "voltage_l1": 1}
+
+
+async def test_burst_is_coalesced_into_one_update(
+    hass: HomeAssistant, mock_config_entry, socket_enabled: None, setup_integration
+) -> None:
+    """Test that datagrams queued on the socket publish once."""
+    coordinator = await setup_integration(mock_config_entry)
+    listener = EarnEP1Listener()
+    transport, _ = await hass.loop.create_datagram_endpoint(
+        lambda: listener, local_addr=("127.0.0.1", 0)
+    )
+    listener.async_register("127.0.0.1", EarnEP1UDPProtocol(coordinator))
+    address = transport.get_extra_info("sockname")
+
+    calls: list[None] = []
+    coordinator.async_add_listener(lambda: calls.append(None), "power_delivered")
+
+    # Everything is in the kernel queue before the loop reads any of it
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+        for payload in (
+            {"power_delivered": 1.0, "voltage_l1": 230.0},
+            {"power_delivered": 2.0, "energy_delivered_tariff1": 10.0},
+            *({"power_delivered": 2.1 + i / 10} for i in range(7)),
+            {"power_delivered": 3.0},
+        ):
+            sender.sendto(json.dumps(payload).encode(), address)
+    try:
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            if calls:
+                break
+        await hass.async_block_till_done()
+    finally:
+        listener.close()
+
+    assert calls == [None]
+    assert coordinator.stats.accepted == 10
+    assert coordinator.data["power_delivered"] == 3.0
+    assert coordinator.data["voltage_l1"] == 230.0
+    assert coordinator.data["energy_delivered_tariff1"] == 10.0
+
+
+async def test_removed_field_listener_not_called(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that a removed keyed listener is no longer notified."""
+    coordinator = await setup_integration(mock_config_entry)
+
+    calls: list[None] = []
+    remove = coordinator.async_add_listener(lambda: calls.append(None), "voltage_l1")
+    remove()
+
+    coordinator.async_set_updated_fields({"voltage_l1": 231.0})
+
+    assert calls == []
+    assert coordinator.data["voltage_l1"] == 231.0
+
+
+def _options_entry(hass: HomeAssistant, options: dict) -> MockConfigEntry:
+    """Create a config entry with the given options."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: MOCK_HOST, "serial": MOCK_SERIAL},
+        options=options,
+        unique_id=MOCK_SERIAL,
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def test_deadband_suppresses_small_changes(
+    hass: HomeAssistant, setup_integration
+) -> None:
+    """Test that changes inside the absolute deadband are not published."""
+    entry = _options_entry(
+        hass, {"voltage_l1_deadband": 0.5, "voltage_l1_precision": 1}
+    )
+    coordinator = await setup_integration(entry)
+    protocol = EarnEP1UDPProtocol(coordinator)
+
+    _send(protocol, {"voltage_l1": 230.04, "power_delivered": 1.0})
+    await hass.async_block_till_done()
+    assert coordinator.data["voltage_l1"] == 230.0
+
+    _send(protocol, {"voltage_l1": 230.3, "power_delivered": 1.1})
+    await hass.async_block_till_done()
+    assert coordinator.data["voltage_l1"] == 230.0
+    # Unfiltered fields are published as-is
+    assert coordinator.data["power_delivered"] == 1.1
+
+    _send(protocol, {"voltage_l1": 230.6})
+    await hass.async_block_till_done()
+    assert coordinator.data["voltage_l1"] == 230.6
+
+
+async def test_deadband_relative_and_max_silence(
+    hass: HomeAssistant, setup_integration
+) -> None:
+    """Test relative deadband and that max silence forces a publish."""
+    entry = _options_entry(
+        hass,
+        {
+            CONF_DEADBAND_MODE: DEADBAND_MODE_RELATIVE,
+            CONF_MAX_SILENCE: 60,
+            "power_delivered_deadband": 10,
+        },
+    )
+    coordinator = await setup_integration(entry)
+
+    with patch.object(hass.loop, "time", return_value=1000.0):
+        coordinator.async_set_updated_fields({"power_delivered": 2.0})
+        coordinator.async_set_updated_fields({"power_delivered": 2.1})
+    assert coordinator.data["power_delivered"] == 2.0
+
+    with patch.object(hass.loop, "time", return_value=1061.0):
+        coordinator.async_set_updated_fields({"power_delivered": 2.1})
+    assert coordinator.data["power_delivered"] == 2.1
+
+
+def test_deadband_publishes_values_it_did_not_publish() -> None:
+    """Test that max silence is due for values published before the filter."""
+    deadband = DeadbandFilter(
+        {"voltage_l1": FieldDeadband(threshold=1.0, precision=None)}, max_silence=10
+    )
+    data = {"voltage_l1": 230.0}
+
+    assert deadband.apply({"voltage_l1": 230.5}, data, 0.0) == {"voltage_l1": 230.5}
+    data["voltage_l1"] = 230.5
+    assert deadband.apply({"voltage_l1": 230.6}, data, 5.0) == {}
+    assert deadband.apply({"voltage_l1": 230.6}, data, 11.0) == {"voltage_l1": 230.6}
+
+
+async def test_malformed_datagram_ignored(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that undecodable and non-object datagrams are dropped."""
+    coordinator = await setup_integration(mock_config_entry)
+    protocol = EarnEP1UDPProtocol(coordinator)
+
+    protocol.datagram_received(b"{garbage", (MOCK_HOST, 16121))
+    protocol.datagram_received(b"[1, 2]", (MOCK_HOST, 16121))
+    await hass.async_block_till_done()
+
+    assert len(coordinator.data) == 0
+
+
+async def test_ingest_counters(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that every drop reason is counted."""
+    coordinator = await setup_integration(mock_config_entry)
+    protocol = EarnEP1UDPProtocol(coordinator)
+
+    _send(protocol, {"power_delivered": 1.0})
+    _send(protocol, {"power_delivered": 1.0})
+    protocol.datagram_received(b"{garbage", (MOCK_HOST, 16121))
+    protocol.datagram_received(b"42", (MOCK_HOST, 16121))
+    await hass.async_block_till_done()
+
+    stats = coordinator.stats
+    assert stats.received == 4
+    assert stats.accepted == 1
+    assert stats.duplicates == 1
+    assert stats.decode_errors == 1
+    assert stats.non_dict == 1
+    assert stats.inter_arrival.count == 3
+    assert stats.handler_latency.count == 4
+    assert stats.publish_latency.count == 1
+
+
+async def test_repeated_datagrams_are_dropped(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that repeats within the duplicate window are dropped before decode."""
+    coordinator = await setup_integration(mock_config_entry)
+    protocol = EarnEP1UDPProtocol(coordinator)
+    first = b'{"power_delivered": 1.0}'
+    second = b'{"power_delivered": 2.0}'
+
+    with (
+        patch(
+            "custom_components.earn_e_p1.coordinator.time.perf_counter",
+            side_effect=[0.0, 0.0, 0.1, 0.1, 0.2, 0.2, 1.0, 1.0],
+        ),
+        patch(
+            "custom_components.earn_e_p1.coordinator.decode_payload",
+            wraps=json.loads,
+        ) as decode,
+    ):
+        protocol.datagram_received(first, (MOCK_HOST, 16121))
+        protocol.datagram_received(second, (MOCK_HOST, 16121))
+        protocol.datagram_received(first, (MOCK_HOST, 16121))
+        # Outside the window the same bytes are a new reading
+        protocol.datagram_received(first, (MOCK_HOST, 16121))
+
+    assert decode.call_count == 3
+    assert coordinator.stats.duplicates == 1
+
+
+async def test_backpressure_keeps_latest_values(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that a backlog is published once with the newest values."""
+    coordinator = await setup_integration(mock_config_entry)
+    udp_listener = EarnEP1Listener()
+    udp_listener.backpressure = True
+    protocol = EarnEP1UDPProtocol(coordinator, udp_listener)
+    listener = MagicMock()
+    coordinator.async_add_listener(listener, "power_delivered")
+
+    for power in (1.0, 2.0, 3.0):
+        _send(protocol, {"power_delivered": power, "voltage_l1": 230.0})
+    _send(protocol, {"energy_delivered_tariff1": 100.0})
+    await hass.async_block_till_done()
+    # The flush waits for the backlog to drain
+    listener.assert_not_called()
+
+    protocol._flush_handle.cancel()
+    protocol._flush()
+    assert coordinator.data["power_delivered"] == 3.0
+    assert coordinator.data["energy_delivered_tariff1"] == 100.0
+    listener.assert_called_once()
+    assert coordinator.stats.superseded == 2
+
+
+async def test_start_applies_receive_buffer(hass: HomeAssistant, tmp_path) -> None:
+    """Test that async_start sizes SO_RCVBUF and reads listener statistics."""
+    entry = _options_entry(hass, {CONF_RECEIVE_BUFFER: 1048576})
+    coordinator = EarnEP1Coordinator(hass, entry, MOCK_HOST, serial=MOCK_SERIAL)
+
+    inode_file = tmp_path / "socket"
+    inode_file.touch()
+    sock = MagicMock()
+    sock.fileno.return_value = os.open(inode_file, os.O_RDONLY)
+    transport = MagicMock()
+    transport.get_extra_info.return_value = sock
+
+    with (
+        patch.object(
+            hass.loop,
+            "create_datagram_endpoint",
+            AsyncMock(return_value=(transport, None)),
+        ),
+        patch(
+            "custom_components.earn_e_p1.coordinator.read_udp_drops",
+            return_value=3,
+        ) as mock_read,
+    ):
+        await coordinator.async_start()
+        listener = async_get_listener(hass)
+        _send(listener, {"power_delivered": 1.0}, host="192.168.1.99")
+        await coordinator._async_refresh_diagnostics()
+        os.close(sock.fileno.return_value)
+        await coordinator.async_stop()
+
+    sock.setsockopt.assert_called_once_with(
+        socket.SOL_SOCKET, socket.SO_RCVBUF, 1048576
+    )
+    mock_read.assert_called_once_with(inode_file.stat().st_ino)
+    assert coordinator.stats.kernel_drops == 3
+    assert listener.unrouted == 1
+    transport.close.assert_called_once()
+    assert async_get_listener(hass) is None
+
+
+async def test_telegram_is_persisted(
+    hass: HomeAssistant, hass_storage, mock_config_entry, setup_integration
+) -> None:
+    """Test that values are saved batched and on unload."""
+    coordinator = await setup_integration(mock_config_entry)
+    key = f"{DOMAIN}.{mock_config_entry.entry_id}"
+
+    coordinator.async_set_updated_fields({"gas_delivered": 1234.5})
+    with patch.object(hass.loop, "time", return_value=hass.loop.time() + 1):
+        coordinator.async_set_updated_fields({"gas_delivered": 1234.51})
+    assert key not in hass_storage
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    await hass.async_block_till_done()
+    stored = hass_storage[key]["data"]
+    assert stored["values"] == {"gas_delivered": 1234.51}
+    # Receive times are stored as wall-clock timestamps
+    assert abs(stored["updated"]["gas_delivered"] - time.time()) < 5
+    assert stored["peak"] == coordinator.peak.as_dict()
+
+    coordinator.async_set_updated_fields({"wifiRSSI": -60, "power_delivered": 2.0})
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    assert hass_storage[key]["data"]["values"]["wifiRSSI"] == -60
+
+    # The peak engine continues where it left off
+    coordinator = await setup_integration(mock_config_entry)
+    assert coordinator.peak.as_dict() == hass_storage[key]["data"]["peak"]
+
+
+async def test_restored_values_keep_their_age(
+    hass: HomeAssistant, hass_storage, mock_config_entry, setup_integration
+) -> None:
+    """Test that values older than their stale time expire at startup."""
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            "values": {"power_delivered": 1.0, "gas_delivered": 1234.5},
+            "updated": {
+                "power_delivered": time.time() - 7 * 86400,
+                "gas_delivered": time.time() - 10,
+            },
+        },
+    }
+    coordinator = await setup_integration(mock_config_entry)
+    now = hass.loop.time()
+    assert now - coordinator.field_updated["power_delivered"] > 86400
+    assert 9 < now - coordinator.field_updated["gas_delivered"] < 12
+
+    coordinator._async_start_expiry()
+    coordinator._stale_timer.cancel()
+    coordinator._async_check_stale()
+    assert coordinator.expired == {"power_delivered"}
+    coordinator._stale_timer.cancel()
+
+
+async def test_stale_fields_expire_with_one_timer(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that unrefreshed fields expire and come back with the next packet."""
+    coordinator = await setup_integration(mock_config_entry)
+    power_updates = MagicMock()
+    gas_updates = MagicMock()
+    coordinator.async_add_listener(power_updates, "power_delivered")
+    coordinator.async_add_listener(gas_updates, "gas_delivered")
+
+    start = hass.loop.time()
+    with patch.object(hass.loop, "time", return_value=start):
+        coordinator._async_track_expiry(coordinator._stale_after, start)
+        coordinator.async_set_updated_fields(
+            {"power_delivered": 1.0, "gas_delivered": 1234.5}
+        )
+    assert coordinator._stale_timer is not None
+    power_updates.reset_mock()
+    gas_updates.reset_mock()
+
+    # Realtime fields expire after 30 s, telegram fields keep their value
+    def fire_timer(now: float) -> None:
+        coordinator._stale_timer.cancel()
+        with patch.object(hass.loop, "time", return_value=now):
+            coordinator._async_check_stale()
+
+    fire_timer(start + 31)
+    assert "power_delivered" in coordinator.expired
+    assert "gas_delivered" not in coordinator.expired
+    power_updates.assert_called_once()
+    gas_updates.assert_not_called()
+    # A single timer stays armed for the next expiry
+    assert coordinator._stale_timer.when() == start + 180
+
+    # The same value brings the field back
+    with patch.object(hass.loop, "time", return_value=start + 32):
+        coordinator.async_set_updated_fields({"power_delivered": 1.0})
+    assert "power_delivered" not in coordinator.expired
+    assert power_updates.call_count == 2
+
+    fire_timer(start + 181)
+    assert "gas_delivered" in coordinator.expired
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    assert coordinator._stale_timer is None
@@ -0,0 +1,23 @@
+"""Tests for the EARN-E P1 Meter datagram decoders."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.earn_e_p1.decoder import DECODE_ERRORS, DECODERS
+
+REALTIME_PACKET = b'{"power_delivered":0.456,"voltage_l1":230.1,"current_l1":2}'
+
+
+@pytest.mark.parametrize("name", DECODERS)
+def test_decoders_agree(name: str) -> None:
+    """Test that every decoder produces the stdlib result."""
+    assert DECODERS[name](REALTIME_PACKET) == DECODERS["json"](REALTIME_PACKET)
+
+
+@pytest.mark.parametrize("name", DECODERS)
+@pytest.mark.parametrize("packet", [b"{not json", b'{"a": "\xff"}', b""])
+def test_decoders_raise_decode_errors(name: str, packet: bytes) -> None:
+    """Test that malformed datagrams raise one of DECODE_ERRORS."""
+    with pytest.raises(DECODE_ERRORS):
+        DECODERS[name](packet)
@@ -0,0 +1,41 @@
+"""Tests for the EARN-E P1 Meter diagnostics."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.components.diagnostics import (
+    get_diagnostics_for_config_entry,
+)
+
+
+async def test_config_entry_diagnostics(
+    hass: HomeAssistant, hass_client, mock_config_entry, setup_integration
+) -> None:
+    """Test diagnostics include redacted data and ingest statistics."""
+    coordinator = await setup_integration(mock_config_entry)
+    coordinator.async_set_updated_fields(
+        {"power_delivered": 1.5, "serial": "E0012345678901234"}
+    )
+    coordinator.stats.received = 3
+
+    diagnostics = await get_diagnostics_for_config_entry(
+        hass, hass_client, mock_config_entry
+    )
+
+    assert diagnostics["entry"]["data"] == {
+        "host": "**REDACTED**",
+        "serial": "**REDACTED**",
+    }
+    assert diagnostics["data"] == {
+        "power_delivered": 1.5,
+        "power_quarter_average": 1.5,
+        "power_quarter_projected": 1.5,
+        "power_month_peak": None,
+        "serial": "**REDACTED**",
+    }
+    assert diagnostics["peak"]["peak"] is None
+    assert diagnostics["ingest"]["received"] == 3
+    # async_start is mocked, so no shared listener is running
+    assert diagnostics["listener"] is None
+    assert diagnostics["capture"] is None
+    assert diagnostics["ingest"]["handler_latency"]["count"] == 0
@@ -0,0 +1,60 @@
+"""Tests for the EARN-E P1 Meter gas flow rate."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.earn_e_p1.gasflow import GasFlow
+
+
+def test_flow_from_steps_and_plateaus() -> None:
+    """Test the flow between steps and its decay on a plateau."""
+    flow = GasFlow()
+    assert flow.add(0.0, 100.0) is None
+    # The first step only starts the clock
+    assert flow.add(60.0, 100.1) is None
+    assert flow.add(120.0, 100.1) is None
+
+    # 0.05 m³ in 300 s is 0.6 m³/h
+    assert flow.add(360.0, 100.15) == pytest.approx(0.6)
+    assert flow.add(420.0, 100.15) == pytest.approx(0.6)
+    # Past the last interval the step is spread over the elapsed time
+    assert flow.add(960.0, 100.15) == pytest.approx(0.3)
+    assert flow.add(36360.0, 100.15) == pytest.approx(0.005)
+
+
+def test_reset_restarts() -> None:
+    """Test that a decreasing reading restarts the measurement."""
+    flow = GasFlow()
+    flow.add(0.0, 100.0)
+    flow.add(300.0, 100.1)
+    assert flow.add(600.0, 100.2) == pytest.approx(1.2)
+
+    assert flow.add(660.0, 0.0) is None
+    assert flow.add(960.0, 0.1) is None
+    assert flow.add(1260.0, 0.2) == pytest.approx(1.2)
+
+
+async def test_coordinator_publishes_gas_flow(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that full telegrams feed the gas flow."""
+    coordinator = await setup_integration(mock_config_entry)
+
+    start = hass.loop.time()
+    for wall, reading in ((0, 10.0), (300, 10.1), (600, 10.2)):
+        with (
+            patch(
+                "custom_components.earn_e_p1.coordinator.time.time", return_value=wall
+            ),
+            patch.object(hass.loop, "time", return_value=start + wall),
+        ):
+            coordinator.async_set_updated_fields({"gas_delivered": reading})
+    assert coordinator.data["gas_flow"] == pytest.approx(1.2)
+
+    # Realtime packets leave the flow alone
+    coordinator.async_set_updated_fields({"power_delivered": 1.0})
+    assert coordinator.data["gas_flow"] == pytest.approx(1.2)
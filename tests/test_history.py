@@ -0,0 +1,52 @@
+"""Tests for the EARN-E P1 Meter realtime sample buffer."""
+
+from __future__ import annotations
+
+from custom_components.earn_e_p1.history import SampleBuffer
+
+
+def test_ring_buffer_keeps_newest_samples() -> None:
+    """Test that a full buffer overwrites its oldest samples in order."""
+    buffer = SampleBuffer(("power_delivered", "voltage_l1"), capacity=3)
+    for second in range(5):
+        buffer.append(100.0 + second, {"power_delivered": second * 0.5})
+
+    assert len(buffer) == 3
+    assert buffer.query() == {
+        "time": [102.0, 103.0, 104.0],
+        "power_delivered": [1.0, 1.5, 2.0],
+        "voltage_l1": [None, None, None],
+    }
+
+
+def test_query_time_range() -> None:
+    """Test that start and end are inclusive and found across the wrap."""
+    buffer = SampleBuffer(("power_delivered",), capacity=4)
+    for second in range(6):
+        buffer.append(float(second), {"power_delivered": 1.234})
+
+    result = buffer.query(start=3.0, end=4.0)
+    assert result == {"time": [3.0, 4.0], "power_delivered": [1.234, 1.234]}
+    assert buffer.query(start=10.0)["time"] == []
+    assert buffer.query(end=1.0)["time"] == []
+
+
+def test_query_downsampled_buckets() -> None:
+    """Test min, max and mean per bucket, with gaps reported as None."""
+    buffer = SampleBuffer(("power_delivered", "voltage_l1"), capacity=10)
+    for second, power in enumerate((1.0, 3.0, 2.0, 4.0)):
+        buffer.append(60.0 + second * 30, {"power_delivered": power})
+
+    assert buffer.query(bucket=60) == {
+        "time": [60.0, 120.0],
+        "power_delivered": {
+            "min": [1.0, 2.0],
+            "max": [3.0, 4.0],
+            "mean": [2.0, 3.0],
+        },
+        "voltage_l1": {
+            "min": [None, None],
+            "max": [None, None],
+            "mean": [None, None],
+        },
+    }
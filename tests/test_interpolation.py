@@ -0,0 +1,91 @@
+"""Tests for the EARN-E P1 Meter interpolated energy counters."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.earn_e_p1.const import DOMAIN
+from custom_components.earn_e_p1.interpolation import EnergyInterpolator
+
+
+def test_interpolates_between_readings() -> None:
+    """Test trapezoidal integration, re-anchoring and drift."""
+    interpolator = EnergyInterpolator()
+    assert interpolator.add(0.0, 3.6) is None
+    assert interpolator.anchor(100.0) == 100.0
+
+    # 3.6 kW for 10 s is 0.01 kWh
+    assert interpolator.add(10.0, 3.6) == 100.01
+    assert interpolator.add(20.0, 0.0) == pytest.approx(100.015)
+
+    assert interpolator.anchor(100.005) == pytest.approx(100.015)
+    assert interpolator.drift == pytest.approx(0.01)
+    # The value holds until the integration passes the last published one
+    assert interpolator.add(30.0, 3.6) == pytest.approx(100.015)
+    assert interpolator.add(40.0, 3.6) == pytest.approx(100.02)
+    assert interpolator.as_dict()["max_drift"] == pytest.approx(0.01)
+
+
+def test_gaps_are_not_integrated() -> None:
+    """Test that power is not integrated across a long gap."""
+    interpolator = EnergyInterpolator()
+    interpolator.anchor(5.0)
+    interpolator.add(0.0, 10.0)
+    assert interpolator.add(600.0, 10.0) == 5.0
+
+
+async def test_coordinator_interpolates_totals(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that both tariffs are summed and extended with realtime power."""
+    coordinator = await setup_integration(mock_config_entry)
+
+    with patch("custom_components.earn_e_p1.coordinator.time.time", return_value=0):
+        coordinator.async_set_updated_fields(
+            {
+                "energy_delivered_tariff1": 1000.0,
+                "energy_delivered_tariff2": 500.0,
+                "power_delivered": 36.0,
+            }
+        )
+    assert coordinator.data["energy_delivered_interpolated"] == 1500.0
+    assert "energy_returned_interpolated" not in coordinator.data
+
+    with patch("custom_components.earn_e_p1.coordinator.time.time", return_value=1):
+        coordinator.async_set_updated_fields({"power_delivered": 36.0})
+    assert coordinator.data["energy_delivered_interpolated"] == 1500.01
+
+    # A telegram with only one tariff uses the stored value of the other
+    with patch.object(hass.loop, "time", return_value=hass.loop.time() + 10):
+        coordinator.async_set_updated_fields({"energy_delivered_tariff2": 500.02})
+    assert coordinator.data["energy_delivered_interpolated"] == 1500.02
+    assert coordinator.interpolators[0][3].drift == pytest.approx(-0.01)
+
+
+async def test_restore_anchors_on_the_meter_reading(
+    hass: HomeAssistant, hass_storage, mock_config_entry, setup_integration
+) -> None:
+    """Test that a restored value ahead of the meter is not seen as drift."""
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            "values": {
+                "energy_delivered_tariff1": 1000.0,
+                "energy_delivered_tariff2": 500.0,
+                "energy_delivered_interpolated": 1500.3,
+            }
+        },
+    }
+    coordinator = await setup_integration(mock_config_entry)
+
+    with patch.object(hass.loop, "time", return_value=hass.loop.time() + 10):
+        coordinator.async_set_updated_fields({"energy_delivered_tariff2": 500.1})
+    interpolator = coordinator.interpolators[0][3]
+    assert interpolator.drift == pytest.approx(-0.1)
+    # The value published before the restart is still the floor
+    assert coordinator.data["energy_delivered_interpolated"] == 1500.3
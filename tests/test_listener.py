@@ -0,0 +1,215 @@
+"""Tests for the EARN-E P1 Meter shared UDP listener."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.earn_e_p1.const import DOMAIN
+from custom_components.earn_e_p1.listener import (
+    MAX_RECENT_DEVICES,
+    RECENT_DEVICE_MAX_AGE,
+    EarnEP1Listener,
+    async_acquire_listener,
+    async_get_listener,
+    async_release_listener,
+)
+
+from .conftest import MOCK_HOST, MOCK_SERIAL
+
+OTHER_HOST = "192.168.1.101"
+OTHER_SERIAL = "E0099999999999999"
+
+
+@pytest.fixture
+def mock_endpoint(hass: HomeAssistant):
+    """Patch socket creation and return the mock."""
+    transport = MagicMock()
+    transport.get_extra_info.return_value = None
+    with patch.object(
+        hass.loop,
+        "create_datagram_endpoint",
+        AsyncMock(return_value=(transport, None)),
+    ) as mock:
+        yield mock
+
+
+async def test_listener_is_reference_counted(
+    hass: HomeAssistant, mock_endpoint
+) -> None:
+    """Test that one socket is shared and closed by the last user."""
+    first = await async_acquire_listener(hass)
+    second = await async_acquire_listener(hass)
+    transport = first.transport
+
+    assert first is second
+    assert mock_endpoint.call_count == 1
+
+    async_release_listener(hass)
+    assert async_get_listener(hass) is first
+    transport.close.assert_not_called()
+
+    async_release_listener(hass)
+    assert async_get_listener(hass) is None
+    transport.close.assert_called_once()
+
+
+async def test_lost_listener_is_replaced(hass: HomeAssistant, mock_endpoint) -> None:
+    """Test that a listener whose socket failed is not handed out again."""
+    first = await async_acquire_listener(hass)
+    handler = MagicMock(spec=asyncio.DatagramProtocol)
+    first.async_register(MOCK_HOST, handler)
+    error = OSError("network down")
+    first.connection_lost(error)
+    handler.connection_lost.assert_called_once_with(error)
+
+    second = await async_acquire_listener(hass)
+    assert second is not first
+    assert mock_endpoint.call_count == 2
+
+    # The old listener's user releasing it leaves the new one open
+    async_release_listener(hass, first)
+    assert async_get_listener(hass) is second
+    async_release_listener(hass, second)
+    assert async_get_listener(hass) is None
+
+
+async def test_dispatch_by_source_ip() -> None:
+    """Test that datagrams reach only the handler for their source."""
+    listener = EarnEP1Listener()
+    handler = MagicMock(spec=asyncio.DatagramProtocol)
+    monitor = MagicMock(spec=asyncio.DatagramProtocol)
+    unregister = listener.async_register(MOCK_HOST, handler)
+    remove_monitor = listener.async_add_monitor(monitor)
+
+    listener.datagram_received(b"{}", (MOCK_HOST, 16121))
+    listener.datagram_received(b"{}", (OTHER_HOST, 16121))
+
+    handler.datagram_received.assert_called_once_with(b"{}", (MOCK_HOST, 16121))
+    assert monitor.datagram_received.call_count == 2
+    assert listener.unrouted == 1
+
+    with pytest.raises(ValueError):
+        listener.async_register(MOCK_HOST, MagicMock())
+
+    unregister()
+    remove_monitor()
+    listener.datagram_received(b"{}", (MOCK_HOST, 16121))
+    handler.connection_lost.assert_called_once_with(None)
+    assert handler.datagram_received.call_count == 1
+    assert monitor.datagram_received.call_count == 2
+    assert listener.unrouted == 2
+
+
+async def test_recent_devices() -> None:
+    """Test that the listener remembers devices and their serials."""
+    listener = EarnEP1Listener()
+    listener.datagram_received(b"{garbage", (OTHER_HOST, 16121))
+    listener.datagram_received(b'{"power_delivered": 1.0}', (MOCK_HOST, 16121))
+
+    (seen,) = listener.recent_devices()
+    assert seen.host == MOCK_HOST
+    assert seen.serial is None
+
+    payload = f'{{"serial": "{MOCK_SERIAL}"}}'.encode()
+    listener.datagram_received(payload, (MOCK_HOST, 16121))
+    with patch("custom_components.earn_e_p1.listener.decode_payload") as mock_decode:
+        listener.datagram_received(b'{"power_delivered": 2.0}', (MOCK_HOST, 16121))
+    mock_decode.assert_not_called()
+
+    (seen,) = listener.recent_devices()
+    assert seen.serial == MOCK_SERIAL
+    assert listener.recent_devices(max_age=-1) == []
+
+
+async def test_recent_devices_skip_needless_decoding() -> None:
+    """Test that configured meters and foreign traffic are not decoded."""
+    listener = EarnEP1Listener()
+    listener.async_register(MOCK_HOST, MagicMock(spec=asyncio.DatagramProtocol))
+    with patch("custom_components.earn_e_p1.listener.decode_payload") as mock_decode:
+        listener.datagram_received(b'{"power_delivered": 1.0}', (MOCK_HOST, 16121))
+        listener.datagram_received(b'{"temperature": 21.5}', (OTHER_HOST, 16121))
+    mock_decode.assert_not_called()
+    assert listener.recent_devices() == []
+
+
+async def test_recent_devices_are_pruned() -> None:
+    """Test that stale devices are evicted and the cache is bounded."""
+    listener = EarnEP1Listener()
+    with patch("custom_components.earn_e_p1.listener.time.monotonic", return_value=0.0):
+        listener.datagram_received(b'{"power_delivered": 1.0}', (OTHER_HOST, 16121))
+    with patch(
+        "custom_components.earn_e_p1.listener.time.monotonic",
+        return_value=RECENT_DEVICE_MAX_AGE + 1,
+    ):
+        for index in range(MAX_RECENT_DEVICES + 1):
+            listener.datagram_received(
+                b'{"power_delivered": 1.0}', (f"10.0.0.{index}", 16121)
+            )
+    assert OTHER_HOST not in listener._recent
+    assert len(listener._recent) == MAX_RECENT_DEVICES
+
+
+async def test_two_meters_share_the_port(hass: HomeAssistant, mock_endpoint) -> None:
+    """Test that two config entries load and receive their own datagrams."""
+    entries = []
+    for host, serial in ((MOCK_HOST, MOCK_SERIAL), (OTHER_HOST, OTHER_SERIAL)):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={CONF_HOST: host, "serial": serial},
+            unique_id=serial,
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        entries.append(entry)
+
+    assert mock_endpoint.call_count == 1
+    listener = async_get_listener(hass)
+    listener.datagram_received(b'{"power_delivered": 1.0}', (MOCK_HOST, 16121))
+    listener.datagram_received(b'{"power_delivered": 2.0}', (OTHER_HOST, 16121))
+    await hass.async_block_till_done()
+
+    assert entries[0].runtime_data.data["power_delivered"] == 1.0
+    assert entries[1].runtime_data.data["power_delivered"] == 2.0
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    assert async_get_listener(hass) is None
+
+
+async def test_heartbeat_detects_stalled_loop(hass: HomeAssistant) -> None:
+    """Test that a late heartbeat switches backpressure on and off."""
+    listener = EarnEP1Listener()
+    start = hass.loop.time()
+
+    with patch.object(hass.loop, "time", return_value=start + 2):
+        listener._async_heartbeat(hass.loop, start)
+    assert listener.backpressure
+    listener._heartbeat.cancel()
+
+    with patch.object(hass.loop, "time", return_value=start + 2.51):
+        listener._async_heartbeat(hass.loop, start + 2.5)
+    assert not listener.backpressure
+    listener.close()
+    assert listener._heartbeat is None
+    assert listener.loop_lag.count == 2
+    assert listener.loop_lag.maximum == pytest.approx(2.0)
+
+
+async def test_one_heartbeat_is_shared(hass: HomeAssistant, mock_endpoint) -> None:
+    """Test that the shared listener runs a single heartbeat for its users."""
+    listener = await async_acquire_listener(hass)
+    heartbeat = listener._heartbeat
+    assert heartbeat is not None
+    assert await async_acquire_listener(hass) is listener
+    assert listener._heartbeat is heartbeat
+
+    async_release_listener(hass)
+    async_release_listener(hass)
+    assert heartbeat.cancelled()
@@ -0,0 +1,144 @@
+"""Tests for the EARN-E P1 Meter long-term statistics."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+from homeassistant.components.recorder.models import StatisticMeanType
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.earn_e_p1.const import CONF_LONG_TERM_STATISTICS, DOMAIN
+from custom_components.earn_e_p1.longterm import HourlyAggregator, statistic_id
+
+from .conftest import MOCK_HOST, MOCK_SERIAL
+
+HOUR = 1700000000 - 1700000000 % 3600
+
+
+def test_aggregator_emits_finished_hours() -> None:
+    """Test that an hour is reported once the next one starts."""
+    aggregator = HourlyAggregator()
+    assert aggregator.add(HOUR + 10, {"power_delivered": 1.0}) == {}
+    assert aggregator.add(HOUR + 20, {"power_delivered": 3.0, "voltage_l1": 230}) == {}
+    assert aggregator.add(HOUR + 30, {"energy_delivered_tariff1": 100.5}) == {}
+    assert aggregator.add(HOUR + 40, {"energy_delivered_tariff1": 100.7}) == {}
+
+    rows = aggregator.add(HOUR + 3600, {"power_delivered": 5.0})
+
+    start = datetime.fromtimestamp(HOUR, UTC)
+    assert rows == {
+        "power_delivered": {"start": start, "mean": 2.0, "min": 1.0, "max": 3.0},
+        "voltage_l1": {"start": start, "mean": 230, "min": 230, "max": 230},
+        "energy_delivered_tariff1": {"start": start, "state": 100.7, "sum": 100.7},
+    }
+    assert aggregator.add(HOUR + 7200, {})["power_delivered"]["mean"] == 5.0
+
+
+def test_statistic_id_is_slugified() -> None:
+    """Test that any identifier yields a valid statistic ID."""
+    assert statistic_id("E00 12-34", "gas_delivered") == (
+        f"{DOMAIN}:e00_12_34_gas_delivered"
+    )
+
+
+async def test_hour_in_progress_survives_restart(
+    hass: HomeAssistant, hass_storage, setup_integration
+) -> None:
+    """Test that a persisted partial hour is imported after a restart."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Meter",
+        data={CONF_HOST: MOCK_HOST, "serial": MOCK_SERIAL},
+        unique_id=MOCK_SERIAL,
+        options={CONF_LONG_TERM_STATISTICS: True},
+    )
+    entry.add_to_hass(hass)
+    hass.config.components.add("recorder")
+    aggregator = HourlyAggregator()
+    aggregator.add(HOUR + 10, {"power_delivered": 1.0, "gas_delivered": 10.5})
+    aggregator.add(HOUR + 20, {"power_delivered": 3.0})
+    hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}",
+        "data": {"values": {}, "hourly": aggregator.as_dict()},
+    }
+    coordinator = await setup_integration(entry)
+
+    with (
+        patch(
+            "custom_components.earn_e_p1.longterm.async_add_external_statistics"
+        ) as mock_import,
+        patch(
+            "custom_components.earn_e_p1.coordinator.time.time",
+            return_value=HOUR + 3600 * 5,
+        ),
+    ):
+        coordinator.async_set_updated_fields({"power_delivered": 2.0})
+
+    start = datetime.fromtimestamp(HOUR, UTC)
+    rows = {
+        call.args[1]["statistic_id"]: call.args[2] for call in mock_import.mock_calls
+    }
+    prefix = f"{DOMAIN}:{MOCK_SERIAL.lower()}_"
+    assert rows == {
+        f"{prefix}power_delivered": [
+            {"start": start, "mean": 2.0, "min": 1.0, "max": 3.0}
+        ],
+        f"{prefix}gas_delivered": [{"start": start, "state": 10.5, "sum": 10.5}],
+    }
+    assert coordinator._data_to_store()["hourly"]["hour"] == HOUR + 3600 * 5
+
+
+async def test_coordinator_imports_and_throttles(
+    hass: HomeAssistant, setup_integration
+) -> None:
+    """Test hourly imports and the reduced realtime publish rate."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Meter",
+        data={CONF_HOST: MOCK_HOST, "serial": MOCK_SERIAL},
+        unique_id=MOCK_SERIAL,
+        options={CONF_LONG_TERM_STATISTICS: True},
+    )
+    entry.add_to_hass(hass)
+    hass.config.components.add("recorder")
+    coordinator = await setup_integration(entry)
+    power_updates = MagicMock()
+    coordinator.async_add_listener(power_updates, "power_delivered")
+
+    start = hass.loop.time()
+    with patch(
+        "custom_components.earn_e_p1.longterm.async_add_external_statistics"
+    ) as mock_import:
+        for second, power in enumerate((1.0, 2.0, 3.0)):
+            with (
+                patch.object(hass.loop, "time", return_value=start + second),
+                patch(
+                    "custom_components.earn_e_p1.coordinator.time.time",
+                    return_value=HOUR + 3598 + second,
+                ),
+            ):
+                coordinator.async_set_updated_fields({"power_delivered": power})
+
+    # Only the first realtime value of the minute is published
+    assert power_updates.call_count == 1
+    assert coordinator.data["power_delivered"] == 1.0
+
+    mock_import.assert_called_once()
+    _, metadata, rows = mock_import.call_args[0]
+    assert metadata["statistic_id"] == f"{DOMAIN}:{MOCK_SERIAL.lower()}_power_delivered"
+    assert metadata["mean_type"] is StatisticMeanType.ARITHMETIC
+    assert metadata["has_sum"] is False
+    assert metadata["unit_of_measurement"] == "kW"
+    assert rows == [
+        {
+            "start": datetime.fromtimestamp(HOUR, UTC),
+            "mean": 1.5,
+            "min": 1.0,
+            "max": 2.0,
+        }
+    ]
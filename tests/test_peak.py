@@ -0,0 +1,75 @@
+"""Tests for the EARN-E P1 Meter quarter-hour peak engine."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.earn_e_p1.peak import QuarterHourPeak
+
+
+def _base() -> float:
+    """Return a timestamp four local quarters before the month ends."""
+    return datetime(
+        2026, 1, 31, 23, 0, tzinfo=dt_util.get_default_time_zone()
+    ).timestamp()
+
+
+def _feed(engine: QuarterHourPeak, start: float, seconds: int, power: float) -> dict:
+    """Feed one sample per second at constant power."""
+    values: dict = {}
+    for second in range(seconds):
+        values = engine.add(start + second, power)
+    return values
+
+
+def test_running_and_projected_average() -> None:
+    """Test the running average and its projection to the quarter's end."""
+    engine = QuarterHourPeak()
+    base = _base()
+    values = _feed(engine, base, 301, 2.0)
+    assert values["power_quarter_average"] == 2.0
+    assert values["power_quarter_projected"] == 2.0
+    assert values["power_month_peak"] is None
+
+    # The remaining two thirds at 5 kW would end the quarter at 4 kW
+    values = engine.add(base + 301, 5.0)
+    assert values["power_quarter_projected"] == pytest.approx(4.0, abs=0.01)
+    assert 2.0 < values["power_quarter_average"] < 2.01
+
+
+def test_month_peak_splits_at_quarter_boundary() -> None:
+    """Test that quarters close at the boundary and feed the month peak."""
+    engine = QuarterHourPeak()
+    base = _base()
+    _feed(engine, base, 900, 2.0)
+    # The interval 899 -> 901 is split at 900: half of it belongs to each quarter
+    values = engine.add(base + 901, 6.0)
+    assert values["power_month_peak"] == pytest.approx(2.0, abs=0.001)
+    assert engine.peak_start == base
+
+    _feed(engine, base + 902, 898, 3.0)
+    values = engine.add(base + 1800, 1.0)
+    assert values["power_month_peak"] == pytest.approx(3.0, abs=0.01)
+    assert engine.peak_start == base + 900
+
+
+def test_month_peak_resets_and_survives_restore() -> None:
+    """Test that a new month starts without a peak and state round-trips."""
+    engine = QuarterHourPeak()
+    base = _base()
+    _feed(engine, base + 1800, 900, 4.0)
+    values = _feed(engine, base + 2700, 900, 1.0)
+    assert values["power_month_peak"] == pytest.approx(4.0, abs=0.01)
+    # The first sample of the next month closes the last quarter and resets
+    assert engine.add(base + 3600, 1.0)["power_month_peak"] is None
+
+    restored = QuarterHourPeak()
+    restored.restore(engine.as_dict())
+    assert restored.add(base + 3601, 1.0) == engine.add(base + 3601, 1.0)
+
+    # Gaps longer than a minute are not integrated
+    values = restored.add(base + 3700, 9.0)
+    assert values["power_quarter_average"] == pytest.approx(1.0, abs=0.01)
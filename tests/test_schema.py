@@ -0,0 +1,108 @@
+"""Tests for the EARN-E P1 Meter payload schema and validation."""
+
+from __future__ import annotations
+
+from custom_components.earn_e_p1.schema import RESET_CONFIRMATIONS, PayloadValidator
+from custom_components.earn_e_p1.stats import IngestStats
+
+
+def test_values_are_coerced() -> None:
+    """Test that numeric strings and ints become the field's type."""
+    payload = PayloadValidator(IngestStats(), {}).apply(
+        {"power_delivered": "1.5", "current_l1": 2, "wifiRSSI": -61.0, "tariff": "2"},
+        {},
+        0.0,
+    )
+    assert payload == {
+        "power_delivered": 1.5,
+        "current_l1": 2.0,
+        "wifiRSSI": -61,
+        "tariff": 2,
+    }
+    assert isinstance(payload["current_l1"], float)
+    assert isinstance(payload["wifiRSSI"], int)
+
+
+def test_unusable_values_are_dropped() -> None:
+    """Test that implausible or malformed values are left out and counted."""
+    stats = IngestStats()
+    payload = PayloadValidator(stats, {}).apply(
+        {
+            "power_delivered": -1.0,
+            "power_returned": "n/a",
+            "voltage_l2": float("nan"),
+            "voltage_l3": 231.0,
+            "current_l2": True,
+            "energy_delivered_tariff1": None,
+            "tariff": 1.5,
+            "serial": "E0012345678901234",
+        },
+        {},
+        0.0,
+    )
+    assert payload == {"voltage_l3": 231.0, "serial": "E0012345678901234"}
+    assert stats.invalid_values == 6
+
+
+def test_decreasing_totals_are_rejected_until_confirmed() -> None:
+    """Test that a glitch is rejected and a persistent reset accepted."""
+    stats = IngestStats()
+    validator = PayloadValidator(stats, {})
+    data = {"energy_delivered_tariff1": 1000.0, "power_delivered": 2.0}
+    validator.apply(data, {}, 0.0)
+
+    # A glitched value, then the counter carries on
+    assert validator.apply({"energy_delivered_tariff1": 10}, data, 10.0) == {}
+    assert validator.apply({"energy_delivered_tariff1": 1000.1}, data, 20.0) == {
+        "energy_delivered_tariff1": 1000.1
+    }
+    # Instantaneous values may go down
+    assert validator.apply({"power_delivered": 0.5}, data, 20.0) == {
+        "power_delivered": 0.5
+    }
+
+    # A replaced meter starts low and counts on from there
+    for step in range(1, RESET_CONFIRMATIONS):
+        reading = {"energy_delivered_tariff1": 5.0 + step / 1000}
+        assert validator.apply(reading, data, 20.0 + 10 * step) == {}
+    reading = {"energy_delivered_tariff1": 5.01}
+    assert validator.apply(reading, data, 60.0) == reading
+    assert stats.decreasing_totals == RESET_CONFIRMATIONS
+
+
+def test_disagreeing_or_zero_readings_never_confirm() -> None:
+    """Test that glitches must agree with each other to count as a reset."""
+    stats = IngestStats()
+    validator = PayloadValidator(stats, {})
+    data = {"gas_delivered": 1234.5}
+    validator.apply(data, {}, 0.0)
+
+    for step in range(RESET_CONFIRMATIONS * 2):
+        assert validator.apply({"gas_delivered": 0.0}, data, 10.0 * step) == {}
+    for step, reading in enumerate((5.0, 3.0, 5.0, 3.0)):
+        assert validator.apply({"gas_delivered": reading}, data, 10.0 * step) == {}
+    assert stats.decreasing_totals == RESET_CONFIRMATIONS * 2 + 4
+
+
+def test_totals_must_rise_at_a_plausible_rate() -> None:
+    """Test that upward spikes are rejected for the elapsed time."""
+    stats = IngestStats()
+    validator = PayloadValidator(stats, {"energy_returned_tariff2": -3600.0})
+    data = {"energy_returned_tariff2": 100.0}
+
+    # 250 kWh per hour, from the restored value's last update
+    assert validator.apply({"energy_returned_tariff2": 350.0}, data, 0.0) != {}
+    data["energy_returned_tariff2"] = 350.0
+    assert validator.apply({"energy_returned_tariff2": 351.0}, data, 10.0) == {}
+    assert validator.apply({"energy_returned_tariff2": 350.5}, data, 10.0) == {
+        "energy_returned_tariff2": 350.5
+    }
+    assert stats.jumping_totals == 1
+
+    # A spike that persists and keeps counting is accepted
+    data["energy_returned_tariff2"] = 350.5
+    for step in range(RESET_CONFIRMATIONS - 1):
+        reading = {"energy_returned_tariff2": 9000.0 + step}
+        assert validator.apply(reading, data, 3600.0 + 60 * step) == {}
+    reading = {"energy_returned_tariff2": 9003.0}
+    assert validator.apply(reading, data, 3720.0) == reading
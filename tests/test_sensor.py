@@ -2,33 +2,25 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 
 from custom_components.earn_e_p1.const import DOMAIN
-from custom_components.earn_e_p1.coordinator import EarnEP1Coordinator
 
 from .conftest import MOCK_SERIAL
 
+ENERGY_ENTITY = "sensor.earn_e_p1_meter_energy_delivered_tariff_1"
 
-async def _setup_integration(hass: HomeAssistant, mock_config_entry) -> EarnEP1Coordinator:
-    """Set up the integration and return the coordinator."""
-    with patch(
-        "custom_components.earn_e_p1.coordinator.EarnEP1Coordinator.async_start",
-        new_callable=AsyncMock,
-    ):
-        await hass.config_entries.async_setup(mock_config_entry.entry_id)
-        await hass.async_block_till_done()
-
-    return mock_config_entry.runtime_data
 
-
-async def test_sensors_created(hass: HomeAssistant, mock_config_entry) -> None:
+async def test_sensors_created(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
     """Test that sensors are created on setup."""
-    coordinator = await _setup_integration(hass, mock_config_entry)
+    coordinator = await setup_integration(mock_config_entry)
 
     # Simulate receiving data
     coordinator.async_set_updated_data({"power_delivered": 1.234})
@@ -39,23 +31,29 @@ async def test_sensors_created(hass: HomeAssistant, mock_config_entry) -> None:
     assert state.state == "1.234"
 
 
-async def test_sensor_unavailable_without_data(
-    hass: HomeAssistant, mock_config_entry
+async def test_sensors_created_when_field_appears(
+    hass: HomeAssistant, mock_config_entry, setup_integration
 ) -> None:
-    """Test sensor is unavailable when no data has been received."""
-    await _setup_integration(hass, mock_config_entry)
+    """Test that field sensors are only created once their key is received."""
+    coordinator = await setup_integration(mock_config_entry)
+    assert hass.states.get("sensor.earn_e_p1_meter_power_delivered") is None
+
+    coordinator.async_set_updated_fields({"power_delivered": 1.0})
     await hass.async_block_till_done()
 
-    state = hass.states.get("sensor.earn_e_p1_meter_power_delivered")
-    assert state is not None
-    assert state.state == "unavailable"
+    assert hass.states.get("sensor.earn_e_p1_meter_power_delivered").state == "1.0"
+    assert hass.states.get("sensor.earn_e_p1_meter_power_returned") is None
+    assert hass.states.get("sensor.earn_e_p1_meter_gas_delivered") is None
 
 
 async def test_sensor_unavailable_when_key_missing(
-    hass: HomeAssistant, mock_config_entry
+    hass: HomeAssistant, mock_config_entry, setup_integration
 ) -> None:
     """Test sensor is unavailable when its specific key is missing from data."""
-    coordinator = await _setup_integration(hass, mock_config_entry)
+    coordinator = await setup_integration(mock_config_entry)
+
+    coordinator.async_set_updated_data({"power_delivered": 1.0, "power_returned": 0.0})
+    await hass.async_block_till_done()
 
     # Set data that doesn't include power_returned
     coordinator.async_set_updated_data({"power_delivered": 1.0})
@@ -66,20 +64,27 @@ async def test_sensor_unavailable_when_key_missing(
     assert state.state == "unavailable"
 
 
-async def test_sensor_native_value(hass: HomeAssistant, mock_config_entry) -> None:
+async def test_sensor_native_value(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
     """Test sensor returns correct native value."""
-    coordinator = await _setup_integration(hass, mock_config_entry)
-
-    coordinator.async_set_updated_data({
-        "power_delivered": 2.5,
-        "voltage_l1": 230.1,
-        "energy_delivered_tariff1": 12345.678,
-    })
+    coordinator = await setup_integration(mock_config_entry)
+
+    coordinator.async_set_updated_data(
+        {
+            "power_delivered": 2.5,
+            "voltage_l1": 230.1,
+            "energy_delivered_tariff1": 12345.678,
+        }
+    )
     await hass.async_block_till_done()
 
     assert hass.states.get("sensor.earn_e_p1_meter_power_delivered").state == "2.5"
     assert hass.states.get("sensor.earn_e_p1_meter_voltage_l1").state == "230.1"
-    assert hass.states.get("sensor.earn_e_p1_meter_energy_delivered_tariff_1").state == "12345.678"
+    assert (
+        hass.states.get("sensor.earn_e_p1_meter_energy_delivered_tariff_1").state
+        == "12345.678"
+    )
 
 
 async def test_device_info(hass: HomeAssistant, mock_config_entry) -> None:
@@ -112,10 +117,10 @@ async def test_device_info(hass: HomeAssistant, mock_config_entry) -> None:
 
 
 async def test_sensor_unique_id_uses_serial(
-    hass: HomeAssistant, mock_config_entry
+    hass: HomeAssistant, mock_config_entry, setup_integration
 ) -> None:
     """Test that sensor unique_id uses serial when available."""
-    coordinator = await _setup_integration(hass, mock_config_entry)
+    coordinator = await setup_integration(mock_config_entry)
 
     coordinator.async_set_updated_data({"power_delivered": 1.0})
     await hass.async_block_till_done()
@@ -124,3 +129,149 @@ async def test_sensor_unique_id_uses_serial(
     entry = entity_registry.async_get("sensor.earn_e_p1_meter_power_delivered")
     assert entry is not None
     assert entry.unique_id == f"{MOCK_SERIAL}_power_delivered"
+
+
+async def test_diagnostic_sensors_disabled_by_default(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that ingest diagnostic sensors are registered but disabled."""
+    await setup_integration(mock_config_entry)
+
+    entity_registry = er.async_get(hass)
+    entry = entity_registry.async_get("sensor.earn_e_p1_meter_packets_received")
+    assert entry is not None
+    assert entry.entity_category is EntityCategory.DIAGNOSTIC
+    assert entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert hass.states.get("sensor.earn_e_p1_meter_packets_received") is None
+
+
+async def test_diagnostic_sensor_refreshes_on_interval(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that an enabled diagnostic sensor updates on the refresh timer."""
+    entity_registry = er.async_get(hass)
+    entity_registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        f"{MOCK_SERIAL}_packets_received",
+        suggested_object_id="earn_e_p1_meter_packets_received",
+        config_entry=mock_config_entry,
+    )
+    coordinator = await setup_integration(mock_config_entry)
+    assert hass.states.get("sensor.earn_e_p1_meter_packets_received").state == "0"
+
+    coordinator.stats.received = 7
+    await coordinator._async_refresh_diagnostics()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.earn_e_p1_meter_packets_received").state == "7"
+
+
+async def test_restored_values_are_stale_until_confirmed(
+    hass: HomeAssistant, hass_storage, mock_config_entry, setup_integration
+) -> None:
+    """Test that restored values show at startup and clear once confirmed."""
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            "values": {"energy_delivered_tariff1": 12345.678, "model": "P1-WiFi"},
+            "updated": {"energy_delivered_tariff1": 1700000000.0},
+        },
+    }
+    coordinator = await setup_integration(mock_config_entry)
+
+    state = hass.states.get(ENERGY_ENTITY)
+    assert state.state == "12345.678"
+    assert state.attributes["stale"] is True
+    assert coordinator.model == "P1-WiFi"
+
+    # An unchanged value still confirms the restored one
+    coordinator.async_set_updated_fields({"energy_delivered_tariff1": 12345.678})
+    await hass.async_block_till_done()
+
+    state = hass.states.get(ENERGY_ENTITY)
+    assert state.state == "12345.678"
+    assert "stale" not in state.attributes
+
+
+async def test_discovered_fields_are_created_at_startup(
+    hass: HomeAssistant, hass_storage, mock_config_entry, setup_integration
+) -> None:
+    """Test that fields discovered before a restart get their sensors at once."""
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            "values": {},
+            "updated": {},
+            "discovered": ["power_delivered", "power_returned"],
+        },
+    }
+    coordinator = await setup_integration(mock_config_entry)
+
+    assert hass.states.get("sensor.earn_e_p1_meter_power_delivered").state == (
+        "unavailable"
+    )
+    assert hass.states.get("sensor.earn_e_p1_meter_power_returned") is not None
+    assert hass.states.get("sensor.earn_e_p1_meter_voltage_l1") is None
+
+    coordinator.async_set_updated_fields({"voltage_l1": 230.0})
+    assert coordinator._data_to_store()["discovered"] == [
+        "power_delivered",
+        "power_returned",
+        "voltage_l1",
+    ]
+
+
+async def test_sensor_unavailable_when_stale(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that an expired field makes only its sensor unavailable."""
+    coordinator = await setup_integration(mock_config_entry)
+    coordinator.async_set_updated_fields(
+        {"power_delivered": 1.0, "gas_delivered": 1234.5}
+    )
+    await hass.async_block_till_done()
+
+    coordinator.expired.add("power_delivered")
+    coordinator._async_update_field_listeners(["power_delivered"])
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.earn_e_p1_meter_power_delivered").state == (
+        "unavailable"
+    )
+    assert hass.states.get("sensor.earn_e_p1_meter_gas_delivered").state == "1234.5"
+
+
+async def test_average_sensor_follows_its_source(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that an enabled average sensor shows the last window's mean."""
+    entity_id = "sensor.earn_e_p1_meter_power_delivered_1_minute_average"
+    entity_registry = er.async_get(hass)
+    entity_registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        f"{MOCK_SERIAL}_power_delivered_average_1m",
+        suggested_object_id="earn_e_p1_meter_power_delivered_1_minute_average",
+        config_entry=mock_config_entry,
+    )
+    coordinator = await setup_integration(mock_config_entry)
+    assert hass.states.get(entity_id) is None
+
+    coordinator.async_set_updated_fields({"power_delivered_average_1m": 1.5})
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "1.5"
+
+    start = hass.loop.time()
+    with patch.object(hass.loop, "time", return_value=start):
+        coordinator._async_track_expiry(["power_delivered"], start)
+    coordinator._stale_timer.cancel()
+    with patch.object(hass.loop, "time", return_value=start + 31):
+        coordinator._async_check_stale()
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "unavailable"
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
@@ -0,0 +1,108 @@
+"""Tests for the EARN-E P1 Meter services."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.earn_e_p1.const import CONF_HISTORY_HOURS, DOMAIN
+from custom_components.earn_e_p1.services import SERVICE_GET_SAMPLES
+
+
+async def test_get_samples(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that realtime packets are sampled and returned by range."""
+    coordinator = await setup_integration(mock_config_entry)
+    for second, power in enumerate((1.0, 2.0, 3.0)):
+        with patch(
+            "custom_components.earn_e_p1.coordinator.time.time",
+            return_value=1700000000.0 + second,
+        ):
+            coordinator.async_set_updated_fields(
+                {"power_delivered": power, "voltage_l1": 230.1}
+            )
+    # Telegram-only packets are not sampled
+    coordinator.async_set_updated_fields({"gas_delivered": 1234.5})
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_SAMPLES,
+        {
+            "config_entry_id": mock_config_entry.entry_id,
+            "start": datetime.fromtimestamp(1700000001, UTC),
+        },
+        blocking=True,
+        return_response=True,
+    )
+    expected = {
+        "time": [1700000001.0, 1700000002.0],
+        "power_delivered": [2.0, 3.0],
+        "power_returned": [None, None],
+        "voltage_l1": [230.1, 230.1],
+        "current_l1": [None, None],
+    }
+    assert {key: response[key] for key in expected} == expected
+    assert response["voltage_l3"] == [None, None]
+
+    # A naive start is in Home Assistant's time zone, not the host's
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_SAMPLES,
+        {
+            "config_entry_id": mock_config_entry.entry_id,
+            # 1700000002 is 2023-11-14 22:13:22 UTC, 23:13:22 in Amsterdam
+            "start": "2023-11-14 23:13:22",
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert response["power_delivered"] == [3.0]
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_SAMPLES,
+        {"config_entry_id": mock_config_entry.entry_id, "bucket": 3600},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["power_delivered"] == {
+        "min": [1.0],
+        "max": [3.0],
+        "mean": [2.0],
+    }
+
+
+async def test_get_samples_errors(
+    hass: HomeAssistant, mock_config_entry, setup_integration
+) -> None:
+    """Test that unknown entries and disabled history are reported."""
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_HISTORY_HOURS: 0}
+    )
+    await setup_integration(mock_config_entry)
+
+    with pytest.raises(ServiceValidationError) as err:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_SAMPLES,
+            {"config_entry_id": mock_config_entry.entry_id},
+            blocking=True,
+            return_response=True,
+        )
+    assert err.value.translation_key == "history_disabled"
+
+    with pytest.raises(ServiceValidationError) as err:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_SAMPLES,
+            {"config_entry_id": "missing"},
+            blocking=True,
+            return_response=True,
+        )
+    assert err.value.translation_key == "entry_not_found"
@@ -0,0 +1,53 @@
+"""Tests for the EARN-E P1 Meter ingest statistics."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from custom_components.earn_e_p1.stats import Histogram, read_udp_drops
+
+
+def test_histogram_buckets_and_quantiles() -> None:
+    """Test bucket counts, mean and quantile bounds."""
+    histogram = Histogram((1.0, 2.0, 5.0))
+    for value in (0.5, 1.0, 1.5, 1.8, 4.0, 9.0):
+        histogram.add(value)
+
+    assert histogram.counts == [2, 2, 1, 1]
+    assert histogram.mean == 17.8 / 6
+    assert histogram.maximum == 9.0
+    assert histogram.quantile(0.5) == 2.0
+    assert histogram.quantile(0.8) == 5.0
+    assert histogram.quantile(1.0) == 9.0
+    assert histogram.as_dict()["buckets"] == {
+        "le_1": 2,
+        "le_2": 2,
+        "le_5": 1,
+        "inf": 1,
+    }
+
+
+def test_empty_histogram() -> None:
+    """Test an empty histogram reports no statistics."""
+    histogram = Histogram((1.0,))
+
+    assert histogram.mean is None
+    assert histogram.quantile(0.95) is None
+
+
+PROC_NET_UDP = """\
+   sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode ref pointer drops
+  123: 00000000:3EF9 00000000:0000 07 00000000:00000000 00:00000000 00000000     0        0 4242 2 0000000000000000 17
+  124: 00000000:0035 00000000:0000 07 00000000:00000000 00:00000000 00000000     0        0 1111 2 0000000000000000 0
+"""
+
+
+def test_read_udp_drops(tmp_path: Path) -> None:
+    """Test that the drops column of the matching socket is returned."""
+    udp = tmp_path / "udp"
+    udp.write_text(PROC_NET_UDP)
+    missing = tmp_path / "udp6"
+
+    assert read_udp_drops(4242, (str(missing), str(udp))) == 17
+    assert read_udp_drops(9999, (str(udp),)) is None
+    assert read_udp_drops(4242, (str(missing),)) is None
@@ -0,0 +1,67 @@
+"""Tests for the EARN-E P1 Meter telegram state."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.earn_e_p1.telegram import TelegramState
+
+
+def test_update_in_place_reports_changed_keys() -> None:
+    """Test that update merges in place and returns only changed keys."""
+    state = TelegramState(("power_delivered", "voltage_l1"))
+
+    assert state.update({"power_delivered": 1.0, "serial": "E001"}) == [
+        "power_delivered",
+        "serial",
+    ]
+    assert state.update({"power_delivered": 1.0, "voltage_l1": 230.0}) == ["voltage_l1"]
+    assert state.update({"power_delivered": 1.0}) == []
+
+    assert state.version == 2
+    assert dict(state) == {
+        "power_delivered": 1.0,
+        "voltage_l1": 230.0,
+        "serial": "E001",
+    }
+
+
+def test_mapping_access() -> None:
+    """Test that missing slots behave like missing dict keys."""
+    state = TelegramState(("power_delivered", "voltage_l1"))
+    state.update({"power_delivered": 0.0})
+
+    assert "power_delivered" in state
+    assert "voltage_l1" not in state
+    assert state.get("voltage_l1") is None
+    assert state.get("unknown", 5) == 5
+    assert len(state) == 1
+    with pytest.raises(KeyError):
+        state["voltage_l1"]
+
+
+def test_snapshot_is_cached_per_version() -> None:
+    """Test that the snapshot is rebuilt only after a change."""
+    state = TelegramState(("power_delivered",))
+    state.update({"power_delivered": 1.0})
+
+    snapshot = state.snapshot()
+    assert state.snapshot() is snapshot
+
+    state.update({"power_delivered": 1.0})
+    assert state.snapshot() is snapshot
+
+    state.update({"power_delivered": 2.0})
+    assert state.snapshot() == {"power_delivered": 2.0}
+    assert state.snapshot() is not snapshot
+
+
+def test_replace_clears_previous_values() -> None:
+    """Test that replace drops values not in the new payload."""
+    state = TelegramState(("power_delivered", "voltage_l1"))
+    state.update({"power_delivered": 1.0, "voltage_l1": 230.0, "model": "P1"})
+
+    state.replace({"voltage_l1": 231.0})
+
+    assert dict(state) == {"voltage_l1": 231.0}
+    assert len(state) == 1